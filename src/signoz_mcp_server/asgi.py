@@ -0,0 +1,82 @@
+"""ASGI entry point serving the MCP JSON-RPC endpoints with FastAPI.
+
+Run with: uvicorn signoz_mcp_server.asgi:app --workers N
+"""
+
+import asyncio
+
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from signoz_mcp_server.mcp_server import (
+    MAX_REQUEST_BODY_BYTES,
+    PARSE_ERROR_BODY,
+    encode_jsonrpc_response,
+    get_http_status_code,
+    handle_jsonrpc_batch,
+    handle_jsonrpc_request,
+)
+
+app = FastAPI(title="signoz-mcp-server", docs_url=None, redoc_url=None, openapi_url=None)
+
+
+def _json_response(payload, status_code=200):
+    return Response(content=encode_jsonrpc_response(payload), status_code=status_code, media_type="application/json")
+
+
+async def _read_body(request):
+    """Return the request body, or None once it is known to exceed MAX_REQUEST_BODY_BYTES."""
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > MAX_REQUEST_BODY_BYTES:
+        return None
+    # The declared length can be absent (chunked uploads) or wrong, so the streamed bytes are counted too
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_REQUEST_BODY_BYTES:
+            return None
+    return bytes(body)
+
+
+async def _dispatch(data):
+    # Only tool calls block on Signoz HTTP requests; everything else is answered in memory on the event loop
+    if type(data) is dict and data.get("method") == "tools/call":
+        return await run_in_threadpool(handle_jsonrpc_request, data)
+    return handle_jsonrpc_request(data)
+
+
+async def _dispatch_batch(batch):
+    if not batch:
+        return handle_jsonrpc_batch(batch)
+    responses = await asyncio.gather(*[_dispatch(data) for data in batch])
+    return [response for response in responses if response is not None] or None
+
+
+@app.get("/mcp")
+async def mcp_get():
+    return _json_response({"message": "This endpoint expects JSON-RPC POST requests. Use POST with application/json."}, 405)
+
+
+@app.post("/mcp")
+async def mcp_endpoint(request: Request):
+    raw = await _read_body(request)
+    if raw is None:
+        return _json_response({"message": f"Request body exceeds {MAX_REQUEST_BODY_BYTES} bytes."}, 413)
+    try:
+        data = orjson.loads(raw) if raw else None
+    except orjson.JSONDecodeError:
+        data = None
+
+    if data is None:
+        return Response(content=PARSE_ERROR_BODY, status_code=400, media_type="application/json")
+
+    response = await (_dispatch_batch(data) if type(data) is list else _dispatch(data))
+    if response is None:
+        return Response(status_code=202)
+    return _json_response(response, get_http_status_code(response))
+
+
+@app.get("/health")
+async def health_check():
+    return _json_response({"status": "ok"})
@@ -0,0 +1,12 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and request.get_json()."""
+
+    def dumps(self, obj, **_kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **_kwargs):
+        return orjson.loads(s)
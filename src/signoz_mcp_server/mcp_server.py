@@ -1,44 +1,110 @@
 import datetime
-import json
+import functools
+import importlib.util
 import logging
 import os
+import shutil
 import sys
+import tempfile
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
 
-import yaml
-from flask import Flask, current_app, jsonify, make_response, request
+import fastjsonschema
+import orjson
 
 from signoz_mcp_server.processor.signoz_processor import SignozApiProcessor
 from signoz_mcp_server.stdio_server import run_stdio_server
 
-app = Flask(__name__)
 logger = logging.getLogger(__name__)
 
 
+def _load_yaml_cached(path):
+    """Load a YAML file, reusing a JSON sidecar (``<path>.json``) when it is at least as new as the YAML source."""
+    cache_path = path + ".json"
+    try:
+        if os.stat(cache_path).st_mtime >= os.stat(path).st_mtime:
+            with open(cache_path, "rb") as cache_file:
+                return orjson.loads(cache_file.read())
+    except (OSError, orjson.JSONDecodeError):
+        pass
+    # Imported lazily: once the JSON sidecar exists, startup does not need the YAML parser at all
+    import yaml
+
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as file:
+        try:
+            config = yaml.load(file, Loader=loader)  # noqa: S506 - CSafeLoader/SafeLoader only build plain Python objects
+        except yaml.YAMLError as e:
+            raise Exception(f"Error parsing YAML configuration: {e}") from e
+    # Best effort: the package directory may be read-only or the YAML may hold non-JSON types
+    try:
+        _write_config_cache(cache_path, orjson.dumps(config), os.stat(path).st_mode & 0o777)
+    except (OSError, orjson.JSONEncodeError):
+        logger.debug("Could not write config cache to %s", cache_path)
+    return config
+
+
+def _write_config_cache(cache_path, data, mode):
+    """Atomically write the config cache with the YAML file's permission bits, since it holds the same API keys."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", prefix=".config-cache-")
+    try:
+        with os.fdopen(fd, "wb") as cache_file:
+            os.fchmod(cache_file.fileno(), mode)
+            cache_file.write(data)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _get_config_value(env_key, yaml_value, default=None):
+    """Return the environment variable if it is set (even to an empty value), else the YAML value, else default."""
+    value = os.environ.get(env_key)
+    if value is not None:
+        return value
+    return default if yaml_value is None else yaml_value
+
+
+def _get_int_config_value(env_key, yaml_value, default):
+    """Like _get_config_value, but an empty environment variable counts as unset and the value must be an integer."""
+    value = os.environ.get(env_key)
+    if value is None or not value.strip():
+        value = default if yaml_value is None else yaml_value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise Exception(f"Invalid configuration: {env_key} must be an integer, got {value!r}") from None
+
+
+# String values accepted as "enabled" for boolean settings such as MCP_SERVER_DEBUG
+_TRUTHY = frozenset({"1", "true", "yes", "on", "y", "t"})
+
+
 # Load configuration from environment variables, then YAML as fallback
+@functools.lru_cache(maxsize=1)
 def load_config():
     config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
     config = {}
     # Try to load YAML config as fallback
     try:
-        with open(config_path) as file:
-            config = yaml.safe_load(file)
+        config = _load_yaml_cached(config_path)
     except FileNotFoundError:
         config = {}
-    except yaml.YAMLError as e:
-        raise Exception(f"Error parsing YAML configuration: {e}") from e
+    # Normalize to the two known sections once; an empty YAML file loads as None
+    config = config or {}
+    signoz_section = config.get("signoz") or {}
+    server_section = config.get("server") or {}
 
     # Environment variable overrides
-    signoz_host = os.environ.get("SIGNOZ_HOST") or (config.get("signoz", {}).get("host") if config.get("signoz") else None)
-    signoz_api_key = os.environ.get("SIGNOZ_API_KEY") or (config.get("signoz", {}).get("api_key") if config.get("signoz") else None)
-    signoz_ssl_verify = os.environ.get("SIGNOZ_SSL_VERIFY") or (
-        config.get("signoz", {}).get("ssl_verify", "true") if config.get("signoz") else "true"
-    )
-    server_port = int(os.environ.get("MCP_SERVER_PORT") or (config.get("server", {}).get("port", 8000) if config.get("server") else 8000))
-    server_debug = os.environ.get("MCP_SERVER_DEBUG")
-    if server_debug is not None:
-        server_debug = server_debug.lower() in ["1", "true", "yes"]
-    else:
-        server_debug = config.get("server", {}).get("debug", True) if config.get("server") else True
+    signoz_host = _get_config_value("SIGNOZ_HOST", signoz_section.get("host"))
+    signoz_api_key = _get_config_value("SIGNOZ_API_KEY", signoz_section.get("api_key"))
+    signoz_ssl_verify = _get_config_value("SIGNOZ_SSL_VERIFY", signoz_section.get("ssl_verify"), "true")
+    server_port = _get_int_config_value("MCP_SERVER_PORT", server_section.get("port"), 8000)
+    server_debug = _get_config_value("MCP_SERVER_DEBUG", server_section.get("debug"), True)
+    if isinstance(server_debug, str):
+        server_debug = server_debug.strip().lower() in _TRUTHY
 
     return {
         "signoz": {"host": signoz_host, "api_key": signoz_api_key, "ssl_verify": signoz_ssl_verify},
@@ -46,17 +112,21 @@ def load_config():
     }
 
 
-# Initialize configuration and processor at app startup
-with app.app_context():
-    config = load_config()
-    app.config["SIGNOZ_CONFIG"] = config.get("signoz", {})
-    app.config["SERVER_CONFIG"] = config.get("server", {})
-    app.config["signoz_processor"] = SignozApiProcessor(
-        signoz_host=app.config["SIGNOZ_CONFIG"].get("host"),
-        signoz_api_key=app.config["SIGNOZ_CONFIG"].get("api_key"),
-        ssl_verify=app.config["SIGNOZ_CONFIG"].get("ssl_verify", "true"),
+@functools.lru_cache(maxsize=1)
+def get_signoz_processor():
+    """Return the process-wide SignozApiProcessor shared by the HTTP and stdio transports."""
+    signoz_config = load_config()["signoz"]
+    return SignozApiProcessor(
+        signoz_host=signoz_config.get("host"),
+        signoz_api_key=signoz_config.get("api_key"),
+        ssl_verify=signoz_config.get("ssl_verify", "true"),
     )
 
+
+# Bound once at import so tool handlers use plain module globals instead of a lookup per call
+SIGNOZ_CONFIG = load_config()["signoz"]
+PROCESSOR = get_signoz_processor()
+
 # Server info
 SERVER_INFO = {"name": "signoz-mcp-server", "version": "1.0.0"}
 
@@ -66,12 +136,40 @@ SERVER_CAPABILITIES = {"tools": {}}
 # Protocol version
 PROTOCOL_VERSION = "2025-06-18"
 
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+def jsonrpc_error(code, message, request_id):
+    return {"jsonrpc": "2.0", "error": {"code": code, "message": message}, "id": request_id}
+
+
+# A body that cannot be decoded has no id to echo, so its error response never varies
+PARSE_ERROR_BODY = orjson.dumps(jsonrpc_error(PARSE_ERROR, "Parse error", None))
+
+
+# (timestamp, formatted) of the last get_current_time_iso() call
+_current_time_iso_cache = [0.0, ""]
+
 
 def get_current_time_iso():
-    date_time = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    """Current UTC time in RFC3339 at second precision, reused for up to a second between calls."""
+    now = time.time()
+    if now - _current_time_iso_cache[0] < 1.0:
+        return _current_time_iso_cache[1]
+    date_time = datetime.datetime.fromtimestamp(now, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    _current_time_iso_cache[0] = now
+    _current_time_iso_cache[1] = date_time
     return date_time
 
 
+# Placeholder in tool descriptions that is replaced with the current time when tools are listed
+CURRENT_TIME_PLACEHOLDER = "{now}"
+
 # Available tools
 TOOLS_LIST = [
     {
@@ -95,7 +193,7 @@ TOOLS_LIST = [
     },
     {
         "name": "fetch_dashboard_data",
-        "description": f"Fetch all panel data for a given Signoz dashboard by name and time range. Current datetime is {get_current_time_iso()}",
+        "description": "Fetch all panel data for a given Signoz dashboard by name and time range. Current datetime is {now}",
         "inputSchema": {
             "type": "object",
             "properties": {
@@ -122,8 +220,8 @@ TOOLS_LIST = [
     {
         "name": "fetch_apm_metrics",
         "description": (
-            f"Fetch standard APM metrics (request rate, error rate, latency, apdex, etc.) for a given service and time range. "
-            f"Current datetime is {get_current_time_iso()}"
+            "Fetch standard APM metrics (request rate, error rate, latency, apdex, etc.) for a given service and time range. "
+            "Current datetime is {now}"
         ),
         "inputSchema": {
             "type": "object",
@@ -278,20 +376,53 @@ TOOLS_LIST = [
         },
     },
 ]
+# Freeze the tool definitions so request handlers cannot mutate the shared list
+TOOLS_LIST = tuple(types.MappingProxyType(tool) for tool in TOOLS_LIST)
+
+
+@functools.lru_cache(maxsize=1)
+def _render_tools_list(_minute_bucket):
+    """Render the tools/list result with the current time filled into tool descriptions.
+    Cached per minute bucket so the rendered list is shared by all requests within that minute."""
+    now = get_current_time_iso()
+    tools = []
+    for tool in TOOLS_LIST:
+        rendered = dict(tool)
+        if CURRENT_TIME_PLACEHOLDER in rendered["description"]:
+            rendered["description"] = rendered["description"].replace(CURRENT_TIME_PLACEHOLDER, now)
+        tools.append(rendered)
+    result = {"tools": tools}
+    return result, orjson.dumps(result)
+
+
+def get_tools_list_result():
+    return _render_tools_list(int(time.time() // 60))[0]
+
+
+def encode_jsonrpc_response(response):
+    """Serialize a JSON-RPC response to bytes.
+    The tools/list result is spliced in from its cached encoding instead of being serialized again."""
+    if type(response) is list:
+        return b"[" + b",".join([encode_jsonrpc_response(item) for item in response]) + b"]"
+    result = response.get("result")
+    if result is not None and "tools" in result:
+        tools_result, encoded_tools_result = _render_tools_list(int(time.time() // 60))
+        if result is tools_result:
+            return b'{"jsonrpc":"2.0","result":' + encoded_tools_result + b',"id":' + orjson.dumps(response.get("id")) + b"}"
+    # Structured tool results are embedded as-is, so they may carry the same integer keys as TOOL_RESULT_DUMPS_OPTIONS allows
+    return orjson.dumps(response, option=TOOL_RESULT_DUMPS_OPTIONS)
 
 
 def test_signoz_connection():
     """Test connection to Signoz API"""
     try:
-        processor = current_app.config["signoz_processor"]
-        signoz_config = current_app.config["SIGNOZ_CONFIG"]
-        result = processor.test_connection()
+        result = PROCESSOR.test_connection()
         if result:
             return {
                 "status": "success",
                 "message": "Successfully connected to Signoz API",
-                "host": signoz_config.get("host"),
-                "ssl_verify": signoz_config.get("ssl_verify", "true"),
+                "host": SIGNOZ_CONFIG.get("host"),
+                "ssl_verify": SIGNOZ_CONFIG.get("ssl_verify", "true"),
             }
         else:
             return {"status": "failed", "message": "Failed to connect to Signoz API"}
@@ -303,8 +434,7 @@ def test_signoz_connection():
 def fetch_signoz_dashboards():
     """Fetch all available dashboards from Signoz"""
     try:
-        signoz_processor = current_app.config["signoz_processor"]
-        result = signoz_processor.fetch_dashboards()
+        result = PROCESSOR.fetch_dashboards()
         if result:
             return {"status": "success", "message": "Successfully fetched dashboards", "data": result}
         else:
@@ -317,8 +447,7 @@ def fetch_signoz_dashboards():
 def fetch_signoz_dashboard_details(dashboard_id):
     """Fetch detailed information about a specific dashboard"""
     try:
-        signoz_processor = current_app.config["signoz_processor"]
-        result = signoz_processor.fetch_dashboard_details(dashboard_id)
+        result = PROCESSOR.fetch_dashboard_details(dashboard_id)
         if result:
             return {"status": "success", "message": f"Successfully fetched dashboard details for ID: {dashboard_id}", "data": result}
         else:
@@ -332,8 +461,7 @@ def fetch_signoz_dashboard_data(dashboard_name, start_time=None, end_time=None,
     Accepts start_time and end_time as RFC3339 or relative strings, or a duration string.
     If start_time and end_time are not provided, defaults to last 3 hours."""
     try:
-        signoz_processor = current_app.config["signoz_processor"]
-        result = signoz_processor.fetch_dashboard_data(
+        result = PROCESSOR.fetch_dashboard_data(
             dashboard_name=dashboard_name, start_time=start_time, end_time=end_time, step=step, variables_json=variables_json, duration=duration
         )
         if result.get("status") == "success":
@@ -349,8 +477,7 @@ def fetch_signoz_apm_metrics(service_name, start_time=None, end_time=None, windo
     (e.g., 'now-2h'), or a duration string (e.g., '2h', '90m'). Defaults to last 3 hours if not provided.
     """
     try:
-        signoz_processor = current_app.config["signoz_processor"]
-        result = signoz_processor.fetch_apm_metrics(service_name, start_time, end_time, window, duration=duration)
+        result = PROCESSOR.fetch_apm_metrics(service_name, start_time, end_time, window, duration=duration)
         return {
             "status": "success",
             "message": f"Fetched APM metrics for service: {service_name}",
@@ -364,8 +491,7 @@ def fetch_signoz_apm_metrics(service_name, start_time=None, end_time=None, windo
 def fetch_signoz_services(start_time=None, end_time=None, duration=None):
     """Fetch all instrumented services from SigNoz"""
     try:
-        signoz_processor = current_app.config["signoz_processor"]
-        result = signoz_processor.fetch_services(start_time, end_time, duration)
+        result = PROCESSOR.fetch_services(start_time, end_time, duration)
         if result and (isinstance(result, dict) and result.get("status") == "error"):
             return {"status": "failed", "message": result.get("message", "Failed to fetch services"), "details": result.get("details")}
         return {"status": "success", "message": "Successfully fetched services", "data": result}
@@ -376,12 +502,11 @@ def fetch_signoz_services(start_time=None, end_time=None, duration=None):
 def execute_signoz_clickhouse_query(query, start_time=None, end_time=None, duration=None, panel_type="table", fill_gaps=False, step=60):
     """Execute a Clickhouse SQL query via the Signoz API."""
     try:
-        signoz_processor = current_app.config["signoz_processor"]
         # Use the same time range logic as other tools
-        start_dt, end_dt = signoz_processor._get_time_range(start_time, end_time, duration, default_hours=3)
-        time_geq = start_dt.timestamp()
-        time_lt = end_dt.timestamp()
-        result = signoz_processor.execute_clickhouse_query_tool(
+        start_ms, end_ms = PROCESSOR._get_time_range_ms(start_time, end_time, duration, default_hours=3)
+        time_geq = start_ms / 1000
+        time_lt = end_ms / 1000
+        result = PROCESSOR.execute_clickhouse_query_tool(
             query=query,
             time_geq=time_geq,
             time_lt=time_lt,
@@ -397,12 +522,11 @@ def execute_signoz_clickhouse_query(query, start_time=None, end_time=None, durat
 def execute_signoz_builder_query(builder_queries, start_time=None, end_time=None, duration=None, panel_type="table", step=60):
     """Execute a Signoz builder query via the Signoz API."""
     try:
-        signoz_processor = current_app.config["signoz_processor"]
         # Use the same time range logic as other tools
-        start_dt, end_dt = signoz_processor._get_time_range(start_time, end_time, duration, default_hours=3)
-        time_geq = start_dt.timestamp()
-        time_lt = end_dt.timestamp()
-        result = signoz_processor.execute_builder_query_tool(
+        start_ms, end_ms = PROCESSOR._get_time_range_ms(start_time, end_time, duration, default_hours=3)
+        time_geq = start_ms / 1000
+        time_lt = end_ms / 1000
+        result = PROCESSOR.execute_builder_query_tool(
             builder_queries=builder_queries,
             time_geq=time_geq,
             time_lt=time_lt,
@@ -417,29 +541,29 @@ def execute_signoz_builder_query(builder_queries, start_time=None, end_time=None
 def fetch_signoz_traces_or_logs(data_type, start_time=None, end_time=None, duration=None, service_name=None, limit=100):
     """Fetch traces or logs from SigNoz using ClickHouse SQL."""
     try:
-        signoz_processor = current_app.config["signoz_processor"]
         # Use the same time range logic as other tools
-        start_dt, end_dt = signoz_processor._get_time_range(start_time, end_time, duration, default_hours=3)
-        time_geq = int(start_dt.timestamp())
-        time_lt = int(end_dt.timestamp())
+        start_ms, end_ms = PROCESSOR._get_time_range_ms(start_time, end_time, duration, default_hours=3)
+        # Whole seconds, for both the SQL bounds and the query_range window
+        time_geq = start_ms // 1000
+        time_lt = end_ms // 1000
         limit = int(limit) if limit else 100
         if data_type == "traces":
             table = "signoz_traces.distributed_signoz_index_v3"
             select_cols = "traceID, serviceName, name, durationNano, statusCode, timestamp"
-            where_clauses = [f"timestamp >= toDateTime64({int(start_dt.timestamp())}, 9)", f"timestamp < toDateTime64({int(end_dt.timestamp())}, 9)"]
+            where_clauses = [f"timestamp >= toDateTime64({time_geq}, 9)", f"timestamp < toDateTime64({time_lt}, 9)"]
             if service_name:
                 where_clauses.append(f"serviceName = '{service_name}'")
         elif data_type == "logs":
             table = "signoz_logs.distributed_logs"
             select_cols = "timestamp, body, severity_text, resource_attributes, trace_id, span_id"
-            where_clauses = [f"timestamp >= toDateTime64({int(start_dt.timestamp())}, 9)", f"timestamp < toDateTime64({int(end_dt.timestamp())}, 9)"]
+            where_clauses = [f"timestamp >= toDateTime64({time_geq}, 9)", f"timestamp < toDateTime64({time_lt}, 9)"]
             if service_name:
                 where_clauses.append(f"JSONExtractString(resource_attributes, 'service.name') = '{service_name}'")
         else:
             return {"status": "error", "message": f"Invalid data_type: {data_type}. Must be 'traces' or 'logs'."}
         where_sql = " AND ".join(where_clauses)
         query = f"SELECT {select_cols} FROM {table} WHERE {where_sql} LIMIT {limit}"
-        result = signoz_processor.execute_clickhouse_query_tool(
+        result = PROCESSOR.execute_clickhouse_query_tool(
             query=query,
             time_geq=time_geq,
             time_lt=time_lt,
@@ -466,100 +590,293 @@ FUNCTION_MAPPING = {
 }
 
 
+# Strings accepted for "number" arguments, e.g. "60" or "0.5"
+NUMERIC_STRING_PATTERN = r"^-?[0-9]+(\.[0-9]+)?$"
+
+
+def _numeric_properties(input_schema):
+    return frozenset(name for name, prop in input_schema.get("properties", {}).items() if prop.get("type") == "number")
+
+
+def _validation_schema(input_schema):
+    """
+    Return the advertised input schema, tightened to reject unknown arguments and relaxed to accept numeric strings (e.g. "60")
+    for number arguments; the pattern only constrains strings, so plain numbers still pass.
+    """
+    numeric = _numeric_properties(input_schema)
+    properties = {
+        name: {"type": ["number", "string"], "pattern": NUMERIC_STRING_PATTERN} if name in numeric else prop
+        for name, prop in input_schema.get("properties", {}).items()
+    }
+    return {**input_schema, "properties": properties, "additionalProperties": False}
+
+
+def _to_number(value):
+    """Convert a validated numeric string to an int, or a float when it has a fractional part."""
+    return float(value) if "." in value else int(value)
+
+
+# Per-tool (function, argument validator, names of number arguments) triples; schemas are compiled once at import.
+# Unknown arguments are rejected up front instead of surfacing as a TypeError from the tool function.
+TOOL_DISPATCH = {
+    sys.intern(tool["name"]): (
+        FUNCTION_MAPPING[tool["name"]],
+        fastjsonschema.compile(_validation_schema(tool["inputSchema"]), use_default=False),
+        _numeric_properties(tool["inputSchema"]),
+    )
+    for tool in TOOLS_LIST
+}
+
+
+def _handle_initialize(request_id, params):
+    """Handle initialization (stateless: just validate and return capabilities)."""
+    client_protocol_version = params.get("protocolVersion")
+    # Accept any protocol version that starts with '2025-'
+    if not (isinstance(client_protocol_version, str) and client_protocol_version.startswith("2025-")):
+        message = f"Unsupported protocol version: {client_protocol_version}. Server supports: {PROTOCOL_VERSION}"
+        return jsonrpc_error(INVALID_PARAMS, message, request_id)
+    return {
+        "jsonrpc": "2.0",
+        "result": {"protocolVersion": PROTOCOL_VERSION, "capabilities": SERVER_CAPABILITIES, "serverInfo": SERVER_INFO},
+        "id": request_id,
+    }
+
+
+def _handle_tools_list(request_id, _params):
+    return {"jsonrpc": "2.0", "result": get_tools_list_result(), "id": request_id}
+
+
+# Processor results can carry integer keys (e.g. grouped series), which orjson rejects unless asked to stringify them
+TOOL_RESULT_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _handle_tools_call(request_id, params):
+    tool_name = params.get("name")
+    arguments = params.get("arguments", {})
+    if not tool_name or type(tool_name) is not str:
+        return jsonrpc_error(INVALID_PARAMS, "Invalid params: 'name' is required for tool execution", request_id)
+    entry = TOOL_DISPATCH.get(tool_name)
+    if entry is None:
+        return jsonrpc_error(METHOD_NOT_FOUND, f"Tool not found: {tool_name}", request_id)
+    func, validate_arguments, numeric_arguments = entry
+    if type(arguments) is dict:
+        # A null optional argument means "not given": let the tool function apply its own default
+        arguments = {key: value for key, value in arguments.items() if value is not None}
+    try:
+        validate_arguments(arguments)
+    except fastjsonschema.JsonSchemaException as e:
+        return jsonrpc_error(INVALID_PARAMS, f"Invalid arguments for tool {tool_name}: {e.message}", request_id)
+    for name in numeric_arguments:
+        if type(arguments.get(name)) is str:
+            arguments[name] = _to_number(arguments[name])
+    try:
+        result = func(**arguments)
+        if params.get("responseFormat") == "structured" and type(result) is dict:
+            # Opt-in: the result is sent once as structuredContent rather than also as a JSON string in text content
+            return {"jsonrpc": "2.0", "result": {"content": [], "structuredContent": result}, "id": request_id}
+        # MCP requires the tool result as a JSON string, so it is encoded compactly here and escaped once more by the
+        # single orjson pass over the envelope; assembling the envelope bytes by hand measured no faster
+        text = orjson.dumps(result, option=TOOL_RESULT_DUMPS_OPTIONS).decode()
+        return {"jsonrpc": "2.0", "result": {"content": [{"type": "text", "text": text}]}, "id": request_id}
+    except Exception as e:
+        return jsonrpc_error(SERVER_ERROR, f"Error executing tool: {e!s}", request_id)
+
+
+def _handle_cache_clear(request_id, _params):
+    """A request (it needs an id, like tools/call) answered with an empty result once the dashboard caches are emptied."""
+    PROCESSOR.clear_dashboard_cache()
+    return {"jsonrpc": "2.0", "result": {}, "id": request_id}
+
+
+def _method_not_found(request_id, method):
+    return jsonrpc_error(METHOD_NOT_FOUND, f"Method not found: {method}", request_id)
+
+
+# JSON-RPC method handlers, each called as handler(request_id, params)
+METHOD_HANDLERS = {
+    "initialize": _handle_initialize,
+    "tools/list": _handle_tools_list,
+    "tools/call": _handle_tools_call,
+    # Request that drops cached dashboard listings/definitions, e.g. right after a dashboard is edited in Signoz
+    "_cache_clear": _handle_cache_clear,
+}
+# Bound once so routing a request is a single call with no attribute lookup
+_get_method_handler = METHOD_HANDLERS.get
+
+
 def handle_jsonrpc_request(data):
+    """Handle a single JSON-RPC message. Returns the response dict, or None for notifications, which get no response."""
+    # Validate the envelope up front with plain type checks so malformed messages get a JSON-RPC error, not an exception
+    if type(data) is not dict:
+        return jsonrpc_error(INVALID_REQUEST, "Invalid Request", None)
     request_id = data.get("id")
     method = data.get("method")
-    params = data.get("params", {})
-
-    # Handle JSON-RPC notifications (no id field or method starts with 'notifications/')
-    if method and method.startswith("notifications/"):
-        logger.info(f"Received notification: {method}")
-        return {"jsonrpc": "2.0", "result": {}, "id": request_id}
-
-    # Handle initialization (stateless: just validate and return capabilities)
-    if method == "initialize":
-        client_protocol_version = params.get("protocolVersion")
-        # Accept any protocol version that starts with '2025-'
-        if not (isinstance(client_protocol_version, str) and client_protocol_version.startswith("2025-")):
-            return {
-                "jsonrpc": "2.0",
-                "error": {"code": -32602, "message": f"Unsupported protocol version: {client_protocol_version}. Server supports: {PROTOCOL_VERSION}"},
-                "id": request_id,
-            }
-        return {
-            "jsonrpc": "2.0",
-            "result": {"protocolVersion": PROTOCOL_VERSION, "capabilities": SERVER_CAPABILITIES, "serverInfo": SERVER_INFO},
-            "id": request_id,
-        }
+    if type(method) is not str:
+        return jsonrpc_error(INVALID_REQUEST, "Invalid Request: 'method' must be a string", request_id)
+
+    # Notifications get no response, so they return before params are looked at or anything is built
+    if method[:14] == "notifications/":
+        logger.info("Received notification: %s", method)
+        return None
+
+    params = data.get("params")
+    if params is None:
+        params = {}
+    elif type(params) is not dict:
+        return jsonrpc_error(INVALID_PARAMS, "Invalid params: 'params' must be an object", request_id)
+
+    handler = _get_method_handler(method)
+    if handler is None:
+        return _method_not_found(request_id, method)
+    return handler(request_id, params)
+
+
+# Tool calls in a batch are independent and spend their time waiting on Signoz, so they run concurrently
+BATCH_MAX_WORKERS = 16
+
+
+@functools.lru_cache(maxsize=1)
+def _get_batch_executor():
+    return ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="jsonrpc-batch")
+
+
+def handle_jsonrpc_batch(batch):
+    """Handle a JSON-RPC batch (a list of messages) in one pass.
+    Returns the list of responses in request order, or None when the batch held only notifications."""
+    if not batch:
+        return jsonrpc_error(INVALID_REQUEST, "Invalid Request: empty batch", None)
+    tool_calls = [type(data) is dict and data.get("method") == "tools/call" for data in batch]
+    if sum(tool_calls) > 1:
+        executor = _get_batch_executor()
+        pending = [executor.submit(handle_jsonrpc_request, data) if is_tool_call else None for data, is_tool_call in zip(batch, tool_calls)]
+        responses = [future.result() if future is not None else handle_jsonrpc_request(data) for data, future in zip(batch, pending)]
+    else:
+        responses = [handle_jsonrpc_request(data) for data in batch]
+    responses = [response for response in responses if response is not None]
+    return responses or None
+
 
-    # Handle tools/list
-    if method == "tools/list":
-        return {"jsonrpc": "2.0", "result": {"tools": TOOLS_LIST}, "id": request_id}
-
-    # Handle tools/call
-    if method == "tools/call":
-        tool_name = params.get("name")
-        arguments = params.get("arguments", {})
-        if not tool_name:
-            return {"jsonrpc": "2.0", "error": {"code": -32602, "message": "Invalid params: 'name' is required for tool execution"}, "id": request_id}
-        if tool_name not in FUNCTION_MAPPING:
-            return {"jsonrpc": "2.0", "error": {"code": -32601, "message": f"Tool not found: {tool_name}"}, "id": request_id}
+def handle_jsonrpc_message(data):
+    """Handle a decoded JSON-RPC payload, which is either a single message or a batch."""
+    if type(data) is list:
+        return handle_jsonrpc_batch(data)
+    return handle_jsonrpc_request(data)
+
+
+# JSON-RPC error codes mapped to HTTP status codes; any other error code maps to 500
+ERROR_CODE_TO_HTTP_STATUS = {
+    PARSE_ERROR: 400,
+    INVALID_REQUEST: 400,
+    INVALID_PARAMS: 400,
+    METHOD_NOT_FOUND: 404,
+}
+
+
+def get_http_status_code(response):
+    """Map a JSON-RPC response to the HTTP status code returned by the HTTP transports."""
+    if type(response) is list:
+        # A batch carries per-message errors in its body, so the HTTP exchange itself succeeded
+        return 200
+    error = response.get("error")
+    if error is None:
+        return 200
+    return ERROR_CODE_TO_HTTP_STATUS.get(error.get("code", SERVER_ERROR), 500)
+
+
+# Upper bound on /mcp request bodies; Flask answers larger uploads with 413 before they are buffered
+MAX_REQUEST_BODY_BYTES = 10 * 1024 * 1024
+
+
+def _build_http_app():
+    """Create the Flask app serving /mcp and /health. Only the HTTP transport needs Flask, so it is imported here."""
+    from flask import Flask, jsonify, make_response, request
+
+    from signoz_mcp_server.json_provider import OrjsonProvider
+
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    # Handlers read the processor and config from module globals, so nothing else is stashed on app.config
+    app.config["MAX_CONTENT_LENGTH"] = MAX_REQUEST_BODY_BYTES
+
+    def _json_response(payload, status_code=200):
+        return app.response_class(encode_jsonrpc_response(payload), status=status_code, mimetype="application/json")
+
+    @app.route("/mcp", methods=["POST", "GET"])
+    def mcp_endpoint():
+        if request.method == "GET":
+            # Return a friendly message or 405 for GET requests
+            return make_response(jsonify({"message": "This endpoint expects JSON-RPC POST requests. Use POST with application/json."}), 405)
+
+        # The body is read once and parsed directly, so Werkzeug does not also keep a cached copy of it
+        raw = request.get_data(cache=False)
         try:
-            func = FUNCTION_MAPPING[tool_name]
-            result = func(**arguments)
-            return {"jsonrpc": "2.0", "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]}, "id": request_id}
-        except Exception as e:
-            return {"jsonrpc": "2.0", "error": {"code": -32000, "message": f"Error executing tool: {e!s}"}, "id": request_id}
-
-    # Unknown method
-    return {"jsonrpc": "2.0", "error": {"code": -32601, "message": f"Method not found: {method}"}, "id": request_id}
-
-
-@app.route("/mcp", methods=["POST", "GET"])
-def mcp_endpoint():
-    if request.method == "GET":
-        # Return a friendly message or 405 for GET requests
-        return make_response(jsonify({"message": "This endpoint expects JSON-RPC POST requests. Use POST with application/json."}), 405)
-
-    data = request.get_json()
-    print(f"Received request: {data}")
-    logger.info(f"Received request: {data}")
-
-    if not data:
-        return jsonify({"jsonrpc": "2.0", "error": {"code": -32700, "message": "Parse error"}, "id": None}), 400
-
-    response = handle_jsonrpc_request(data)
-    status_code = 200
-    if "error" in response:
-        # Map error codes to HTTP status codes
-        code = response["error"].get("code", -32000)
-        if code == -32700 or code == -32600 or code == -32602:
-            status_code = 400
-        elif code == -32601:
-            status_code = 404
-        else:
-            status_code = 500
-    return jsonify(response), status_code
+            data = orjson.loads(raw) if raw else None
+        except orjson.JSONDecodeError:
+            data = None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received request: %s", data)
+
+        if data is None:
+            return parse_error_response
+
+        response = handle_jsonrpc_message(data)
+        if response is None:
+            return accepted_response
+        return _json_response(response, get_http_status_code(response))
+
+    parse_error_response = app.response_class(PARSE_ERROR_BODY, status=400, mimetype="application/json")
+    # Notifications are acknowledged with 202 Accepted and no body, as the MCP HTTP transport specifies
+    accepted_response = app.response_class(status=202)
+    # Health probes hit this endpoint constantly, so the response is built once and reused
+    health_response = app.response_class(b'{"status":"ok"}', status=200, mimetype="application/json")
 
+    @app.route("/health", methods=["GET"])
+    def health_check():
+        return health_response
 
-@app.route("/health", methods=["GET"])
-def health_check():
-    return jsonify({"status": "ok"})
+    return app
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_app():
+    return _build_http_app()
+
+
+def __getattr__(name):
+    # `app` is built on first access so that stdio invocations never import or initialize Flask
+    if name == "app":
+        return get_http_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main():
     transport = os.environ.get("MCP_TRANSPORT", "http")
     if ("-t" in sys.argv and "stdio" in sys.argv) or ("--transport" in sys.argv and "stdio" in sys.argv) or (transport == "stdio"):
+        run_stdio_server(handle_jsonrpc_message)
+    else:
+        server_config = load_config()["server"]
+        port = server_config.get("port", 8000)
+        debug = server_config.get("debug", True)
+        gunicorn_path = shutil.which("gunicorn")
+        if debug or gunicorn_path is None:
+            # Werkzeug dev server: needed for the debugger/reloader, or when the 'prod' extra is not installed
+            get_http_app().run(host="0.0.0.0", port=port, debug=debug)
+        else:
+            run_gunicorn(gunicorn_path, port)
 
-        def stdio_handler(data):
-            with app.app_context():
-                return handle_jsonrpc_request(data)
 
-        run_stdio_server(stdio_handler)
+def run_gunicorn(gunicorn_path, port):
+    """Replace the current process with gunicorn serving the Flask app.
+    Tool calls spend most of their time waiting on Signoz, so gevent workers are used when available,
+    otherwise threaded workers so concurrent requests are not serialized behind one upstream call."""
+    cpu_count = os.cpu_count() or 1
+    if importlib.util.find_spec("gevent"):
+        worker_args = ["-k", "gevent", "-w", str(2 * cpu_count + 1)]
     else:
-        port = app.config["SERVER_CONFIG"].get("port", 8000)
-        debug = app.config["SERVER_CONFIG"].get("debug", True)
-        app.run(host="0.0.0.0", port=port, debug=debug)
+        worker_args = ["-k", "gthread", "--threads", "32", "-w", str(cpu_count)]
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    args = ["gunicorn", *worker_args, "-b", f"0.0.0.0:{port}", "--pythonpath", src_dir, "signoz_mcp_server.mcp_server:app"]
+    os.execv(gunicorn_path, args)  # noqa: S606
 
 
 if __name__ == "__main__":
@@ -1,30 +1,128 @@
-import json
+import functools
 import logging
 import re
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
+import orjson
 import requests
-from dateutil import parser as dateparser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from signoz_mcp_server.processor.processor import Processor
 
 logger = logging.getLogger(__name__)
 
+# Time-string patterns used on every tool call, compiled once
+_STEP_RE = re.compile(r"^(\d+)([smhd])$")
+_DURATION_RE = re.compile(r"^(\d+)([hm])$")
+_NOW_OFFSET_RE = re.compile(r"now-(\d+)([smhd])")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+# Request bodies may carry user-supplied variables/filters with non-string keys, which orjson rejects by default
+PAYLOAD_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+_FALSY = frozenset({"false", "0", "no", "off"})
+# Builder query names, assigned in order; one query_range request can carry at most this many builder queries
+_QUERY_LETTERS = tuple(chr(c) for c in range(ord("A"), ord("Z") + 1))
+MAX_BUILDER_QUERIES = len(_QUERY_LETTERS)
+
+
+def _query_letters():
+    """Return an iterator over builder query names A-Z. Callers check MAX_BUILDER_QUERIES first so names never repeat."""
+    return iter(_QUERY_LETTERS)
+
+
+# Upper bound on concurrent query_range POSTs for one dashboard; stays within the session's connection pool
+MAX_PANEL_WORKERS = 16
+# Dashboard listings and definitions change rarely, so successful fetches are reused for a short time
+DASHBOARD_CACHE_TTL_SECONDS = 60
+DASHBOARD_CACHE_MAXSIZE = 256
+# Identical query_range bodies within this window (tool retries, duplicate panels) reuse the first response
+QUERY_RANGE_CACHE_TTL_SECONDS = 5
+QUERY_RANGE_CACHE_MAXSIZE = 256
+# (connect, read) timeouts in seconds; a stalled query must not hold a panel worker for long
+HEALTH_CHECK_TIMEOUT = (3, 5)
+QUERY_RANGE_TIMEOUT = (5, 30)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_absolute_time(time_str):
+    """Parse an absolute time string to a UTC datetime, or None if it cannot be parsed.
+    ISO-8601/RFC3339 input goes through datetime.fromisoformat; anything else falls back to dateutil."""
+    try:
+        try:
+            dt = datetime.fromisoformat(time_str)
+        except ValueError:
+            # Imported lazily: only non-ISO input needs dateutil's full grammar parser
+            from dateutil import parser as dateparser
+
+            dt = dateparser.parse(time_str)
+            if dt is None:
+                logger.error(f"_parse_time: dateparser.parse returned None for input '{time_str}'")
+                return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
+    except Exception as e:
+        logger.error(f"_parse_time: Exception parsing '{time_str}': {e}")
+        return None
+
+
+def _ts_to_ms(ts):
+    """Normalize an epoch timestamp to milliseconds; values below 1e12 are taken to be seconds."""
+    return int(ts * 1000) if ts < 1e12 else int(ts)
+
+
+def _dt_to_ms_range(start_dt, end_dt):
+    return int(start_dt.timestamp() * 1000), int(end_dt.timestamp() * 1000)
+
+
+class _TTLCache:
+    """Small thread-safe cache whose entries expire ttl seconds after being set; the oldest entry is evicted when full."""
+
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                # Dicts keep insertion order, so the first key is the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
 
 class SignozDashboardQueryBuilder:
     def __init__(self, global_step, variables):
         self.global_step = global_step
         self.variables = variables
-        self.query_letter_ord = ord("A")
+        self.query_letters = _query_letters()
+
+    def begin_panel(self):
+        """Start naming queries from A again; each panel is sent as its own query_range request."""
+        self.query_letters = _query_letters()
 
     def _get_next_query_letter(self):
-        letter = chr(self.query_letter_ord)
-        self.query_letter_ord += 1
-        if self.query_letter_ord > ord("Z"):
-            self.query_letter_ord = ord("A")
-        return letter
+        return next(self.query_letters)
 
     def build_query_dict(self, query_data):
+        # query_data belongs to the cached dashboard definition, which other requests share, so it is copied instead of
+        # being rewritten in place
         query_dict = dict(query_data)
         current_letter = self._get_next_query_letter()
         query_dict.pop("step_interval", None)
@@ -40,13 +138,10 @@ class SignozDashboardQueryBuilder:
         return current_letter, query_dict
 
     def build_panel_payload(self, panel_type, panel_queries, start_time, end_time):
-        # Ensure timestamps are in milliseconds
-        def to_ms(ts):
-            return int(ts * 1000) if ts < 1e12 else int(ts)
-
         payload = {
-            "start": to_ms(start_time),
-            "end": to_ms(end_time),
+            # Ensure timestamps are in milliseconds
+            "start": _ts_to_ms(start_time),
+            "end": _ts_to_ms(end_time),
             "step": self.global_step,
             "variables": self.variables,
             "formatForWeb": False,
@@ -57,7 +152,7 @@ class SignozDashboardQueryBuilder:
                 "builderQueries": panel_queries,
             },
         }
-        return json.loads(json.dumps(payload, ensure_ascii=False, indent=None))
+        return payload
 
 
 # Hardcoded builder query templates for standard APM metrics (matching SigNoz frontend)
@@ -156,6 +251,30 @@ APM_METRIC_QUERIES = {
         },
     },
 }
+# Templates are read-only; queries are built from shallow copies, so nested values are shared and must not be mutated
+APM_METRIC_QUERIES = types.MappingProxyType(
+    {
+        key: types.MappingProxyType({subkey: types.MappingProxyType(sub) for subkey, sub in template.items()})
+        if key == "latency"
+        else types.MappingProxyType(template)
+        for key, template in APM_METRIC_QUERIES.items()
+    }
+)
+
+# Attribute keys of the APM service/operation filters. They are shared by every request and must not be mutated
+# (plain dicts, since orjson cannot serialize MappingProxyType)
+_SERVICE_NAME_FILTER_KEY = {"key": "service.name", "dataType": "string", "isColumn": False, "type": "resource"}
+_OPERATION_FILTER_KEY = {"key": "operation", "dataType": "string", "isColumn": False, "type": "tag"}
+
+
+def _build_apm_query(template, step_val, filters, query_name):
+    """Copy an APM template, setting only the fields that differ per request. A query's expression is its own name."""
+    query = dict(template)
+    query["stepInterval"] = step_val
+    query["filters"] = filters
+    query["queryName"] = query_name
+    query["expression"] = query_name
+    return query
 
 
 class SignozApiProcessor(Processor):
@@ -164,17 +283,57 @@ class SignozApiProcessor(Processor):
     def __init__(self, signoz_host, signoz_api_key=None, ssl_verify="true"):
         self.__host = signoz_host
         self.__api_key = signoz_api_key
-        self.__ssl_verify = not (ssl_verify and ssl_verify.lower() == "false")
+        # Resolved to a bool once. YAML may supply a real bool; strings such as "false"/"0"/"no" disable verification
+        if isinstance(ssl_verify, bool):
+            self.__ssl_verify = ssl_verify
+        else:
+            self.__ssl_verify = str(ssl_verify).strip().lower() not in _FALSY
         self.headers = {"Content-Type": "application/json", "Accept": "application/json"}
         if self.__api_key:
             self.headers["SIGNOZ-API-KEY"] = f"{self.__api_key}"
+        # Reuse pooled keep-alive connections to Signoz instead of a new TCP/TLS handshake per call
+        self.session = requests.Session()
+        # Headers live on the session; verify stays per call because requests lets REQUESTS_CA_BUNDLE override a session-level verify=False
+        self.session.headers.update(self.headers)
+        # query_range POSTs are read-only, so they are retried like GETs on connect errors and 502/503/504; once retries run out the
+        # last response is returned. Read timeouts are not retried (read=False) so one stalled query costs a single read timeout
+        retry = Retry(
+            total=2, read=False, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=("GET", "POST"), raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._dashboard_cache = _TTLCache(DASHBOARD_CACHE_TTL_SECONDS, DASHBOARD_CACHE_MAXSIZE)
+        self._query_range_cache = _TTLCache(QUERY_RANGE_CACHE_TTL_SECONDS, QUERY_RANGE_CACHE_MAXSIZE)
+        self._dashboard_title_index_lock = threading.Lock()
+        # (dashboards listing, {title: id}) for the listing the index was last built from
+        self._dashboard_title_index = (None, {})
+
+    def _cached_dashboard_fetch(self, key, fetch):
+        """Return fetch() through the dashboard TTL cache. Empty results are not cached so failures are retried.
+        Cached values are shared by reference and must not be mutated by callers."""
+        result = self._dashboard_cache.get(key)
+        if result is not None:
+            return result
+        result = fetch()
+        if result:
+            self._dashboard_cache.set(key, result)
+        return result
+
+    def clear_dashboard_cache(self):
+        self._dashboard_cache.clear()
+        with self._dashboard_title_index_lock:
+            self._dashboard_title_index = (None, {})
+
+    def close(self):
+        """Close the pooled connections to Signoz."""
+        self.session.close()
 
     def test_connection(self):
         try:
             url = f"{self.__host}/api/v1/health"
-            response = requests.get(url, headers=self.headers, verify=self.__ssl_verify, timeout=20)
-            print(f"Response: {response.text}")
-            logger.info(f"Response: {response.text}")
+            response = self.session.get(url, verify=self.__ssl_verify, timeout=HEALTH_CHECK_TIMEOUT)
+            logger.info("Response: %s", response.text)
             if response and response.status_code == 200:
                 return True
             else:
@@ -185,12 +344,41 @@ class SignozApiProcessor(Processor):
             raise e
 
     def fetch_dashboards(self):
+        return self._cached_dashboard_fetch(("list",), self._request_dashboards)
+
+    def fetch_dashboard_details(self, dashboard_id):
+        return self._cached_dashboard_fetch(("details", dashboard_id), lambda: self._request_dashboard_details(dashboard_id))
+
+    def _find_dashboard_id(self, dashboards, dashboard_name):
+        """Look up a dashboard id by title, rebuilding the title index only when the cached listing changes."""
+        with self._dashboard_title_index_lock:
+            indexed_listing, index = self._dashboard_title_index
+            if indexed_listing is not dashboards:
+                index = {}
+                for d in dashboards["data"]:
+                    # The first dashboard with a given title wins, as with a linear scan
+                    index.setdefault(d.get("data", {}).get("title"), d.get("id"))
+                self._dashboard_title_index = (dashboards, index)
+        return index.get(dashboard_name)
+
+    def _fetch_known_dashboard_details(self, dashboard_name):
+        """Fetch details by id when the title index already knows the dashboard, skipping the listing.
+        Returns None when the title is unknown or the dashboard no longer has that title, so the caller re-resolves it."""
+        with self._dashboard_title_index_lock:
+            dashboard_id = self._dashboard_title_index[1].get(dashboard_name)
+        if dashboard_id is None:
+            return None
+        dashboard_details = self.fetch_dashboard_details(dashboard_id)
+        if not dashboard_details or dashboard_details.get("data", {}).get("title") != dashboard_name:
+            return None
+        return dashboard_details
+
+    def _request_dashboards(self):
         try:
             url = f"{self.__host}/api/v1/dashboards"
-            response = requests.get(url, headers=self.headers, verify=self.__ssl_verify, timeout=60)
-            print(response)
+            response = self.session.get(url, verify=self.__ssl_verify, timeout=60)
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(f"Failed to fetch dashboards: {response.status_code} - {response.text}")
                 return None
@@ -198,13 +386,13 @@ class SignozApiProcessor(Processor):
             logger.error(f"Exception when fetching dashboards: {e}")
             raise e
 
-    def fetch_dashboard_details(self, dashboard_id):
+    def _request_dashboard_details(self, dashboard_id):
         try:
             url = f"{self.__host}/api/v1/dashboards/{dashboard_id}"
-            response = requests.get(url, headers=self.headers, verify=self.__ssl_verify, timeout=30)
+            response = self.session.get(url, verify=self.__ssl_verify, timeout=30)
 
             if response.status_code == 200:
-                response_data = response.json()
+                response_data = orjson.loads(response.content)
                 return response_data.get("data", response_data)
             else:
                 logger.error(f"Failed to fetch dashboard details: {response.status_code} - {response.text}")
@@ -213,30 +401,26 @@ class SignozApiProcessor(Processor):
             logger.error(f"Exception when fetching dashboard details: {e}")
             raise e
 
-    def _get_time_range(self, start_time=None, end_time=None, duration=None, default_hours=3):
+    def _get_time_range_ms(self, start_time=None, end_time=None, duration=None, default_hours=3):
         """
-        Returns (start_dt, end_dt) as UTC datetimes.
+        Returns (start_ms, end_ms) as epoch milliseconds.
         - If start_time and end_time are provided, use those.
         - Else if duration is provided, use (now - duration, now).
         - Else, use (now - default_hours, now).
+        Relative windows are computed with integer arithmetic; only explicit start/end times are parsed into datetimes.
         """
-        now_dt = datetime.now(timezone.utc)
+        now_ms = time.time_ns() // 1_000_000
+        default_ms = default_hours * 3_600_000
         if start_time and end_time:
             start_dt = self._parse_time(start_time)
             end_dt = self._parse_time(end_time)
-            if not start_dt or not end_dt:
-                start_dt = now_dt - timedelta(hours=default_hours)
-                end_dt = now_dt
+            if start_dt and end_dt:
+                return _dt_to_ms_range(start_dt, end_dt)
         elif duration:
             dur_ms = self._parse_duration(duration)
-            if dur_ms is None:
-                dur_ms = default_hours * 60 * 60 * 1000
-            start_dt = now_dt - timedelta(milliseconds=dur_ms)
-            end_dt = now_dt
-        else:
-            start_dt = now_dt - timedelta(hours=default_hours)
-            end_dt = now_dt
-        return start_dt, end_dt
+            if dur_ms is not None:
+                return now_ms - dur_ms, now_ms
+        return now_ms - default_ms, now_ms
 
     def fetch_services(self, start_time=None, end_time=None, duration=None):
         """
@@ -247,16 +431,16 @@ class SignozApiProcessor(Processor):
         Returns a list of services or error details.
         """
         # Use standardized time range logic
-        start_dt, end_dt = self._get_time_range(start_time, end_time, duration, default_hours=24)
-        start_ns = int(start_dt.timestamp() * 1_000_000_000)
-        end_ns = int(end_dt.timestamp() * 1_000_000_000)
+        start_ms, end_ms = self._get_time_range_ms(start_time, end_time, duration, default_hours=24)
+        start_ns = start_ms * 1_000_000
+        end_ns = end_ms * 1_000_000
 
         try:
             url = f"{self.__host}/api/v1/services"
             payload = {"start": str(start_ns), "end": str(end_ns), "tags": []}
-            response = requests.post(url, headers=self.headers, json=payload, verify=self.__ssl_verify, timeout=30)
+            response = self.session.post(url, data=orjson.dumps(payload, option=PAYLOAD_DUMPS_OPTIONS), verify=self.__ssl_verify, timeout=30)
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(f"Failed to fetch services: {response.status_code} - {response.text}")
                 return {"status": "error", "message": f"Failed to fetch services: {response.status_code}", "details": response.text}
@@ -269,18 +453,10 @@ class SignozApiProcessor(Processor):
         if isinstance(step, int):
             return step
         if isinstance(step, str):
-            match = re.match(r"^(\d+)([smhd])$", step)
+            match = _STEP_RE.match(step)
             if match:
                 value, unit = match.groups()
-                value = int(value)
-                if unit == "s":
-                    return value
-                elif unit == "m":
-                    return value * 60
-                elif unit == "h":
-                    return value * 3600
-                elif unit == "d":
-                    return value * 86400
+                return int(value) * _UNIT_SECONDS[unit]
             else:
                 try:
                     return int(step)
@@ -293,14 +469,10 @@ class SignozApiProcessor(Processor):
         """Parse duration string like '2h', '90m' into milliseconds."""
         if not duration_str or not isinstance(duration_str, str):
             return None
-        match = re.match(r"^(\d+)([hm])$", duration_str.strip().lower())
+        match = _DURATION_RE.match(duration_str.strip().lower())
         if match:
             value, unit = match.groups()
-            value = int(value)
-            if unit == "h":
-                return value * 60 * 60 * 1000
-            elif unit == "m":
-                return value * 60 * 1000
+            return int(value) * _UNIT_SECONDS[unit] * 1000
         try:
             # fallback: try to parse as integer minutes
             value = int(duration_str)
@@ -321,51 +493,43 @@ class SignozApiProcessor(Processor):
         time_str = time_str.strip().lower()
         if time_str.startswith("now"):
             if "-" in time_str:
-                match = re.match(r"now-(\d+)([smhd])", time_str)
+                match = _NOW_OFFSET_RE.match(time_str)
                 if match:
                     value, unit = match.groups()
-                    value = int(value)
-                    if unit == "s":
-                        delta = timedelta(seconds=value)
-                    elif unit == "m":
-                        delta = timedelta(minutes=value)
-                    elif unit == "h":
-                        delta = timedelta(hours=value)
-                    elif unit == "d":
-                        delta = timedelta(days=value)
-                    else:
-                        delta = timedelta()
-                    logger.debug(f"_parse_time: Parsed relative time '{time_str_orig}' as now - {value}{unit}")
+                    delta = timedelta(seconds=int(value) * _UNIT_SECONDS[unit])
+                    logger.debug("_parse_time: Parsed relative time '%s' as now - %s%s", time_str_orig, value, unit)
                     return datetime.now(timezone.utc) - delta
-            logger.debug(f"_parse_time: Parsed 'now' as current UTC time for input '{time_str_orig}'")
+            logger.debug("_parse_time: Parsed 'now' as current UTC time for input '%s'", time_str_orig)
             return datetime.now(timezone.utc)
         else:
-            try:
-                dt = dateparser.parse(time_str_orig)
-                if dt is None:
-                    logger.error(f"_parse_time: dateparser.parse returned None for input '{time_str_orig}'")
-                    return None
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                logger.debug(f"_parse_time: Successfully parsed '{time_str_orig}' as {dt.isoformat()}")
-                return dt.astimezone(timezone.utc)
-            except Exception as e:
-                logger.error(f"_parse_time: Exception parsing '{time_str_orig}': {e}")
-                return None
+            dt = _parse_absolute_time(time_str_orig)
+            if dt is not None:
+                logger.debug("_parse_time: Successfully parsed '%s' as %s", time_str_orig, dt)
+            return dt
 
     def _post_query_range(self, payload):
         """
         Helper method to POST to /api/v4/query_range and handle response.
+        Successful responses are cached for QUERY_RANGE_CACHE_TTL_SECONDS; cached values are shared by reference
+        and must not be mutated by callers.
         """
         url = f"{self.__host}/api/v4/query_range"
-        print(f"Querying: {payload}")
-        print(f"URL: {url}")
         try:
-            response = requests.post(url, headers=self.headers, json=payload, verify=self.__ssl_verify, timeout=30)
+            # Encoded with orjson up front; the session headers already declare the JSON content type.
+            # Sorted keys make equivalent payloads byte-identical, so the body itself is the cache key
+            body = orjson.dumps(payload, option=PAYLOAD_DUMPS_OPTIONS | orjson.OPT_SORT_KEYS)
+            cached = self._query_range_cache.get(body)
+            if cached is not None:
+                return cached
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Querying %s: %s", url, body)
+            response = self.session.post(url, data=body, verify=self.__ssl_verify, timeout=QUERY_RANGE_TIMEOUT)
             if response.status_code == 200:
                 try:
-                    resp_json = response.json()
-                    print("response json:::", resp_json)
+                    resp_json = orjson.loads(response.content)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("query_range response size=%d", len(response.content))
+                    self._query_range_cache.set(body, resp_json)
                     return resp_json
                 except Exception as e:
                     logger.error(f"Failed to parse JSON: {e}, response text: {response.text}")
@@ -373,6 +537,10 @@ class SignozApiProcessor(Processor):
             else:
                 logger.error(f"Failed to query metrics: {response.status_code} - {response.text}")
                 return {"error": f"HTTP {response.status_code}", "raw_response": response.text}
+        except requests.Timeout as e:
+            # Reported like an HTTP failure so a dashboard fetch still returns the other panels
+            logger.error(f"Timed out posting to query_range: {e}")
+            return {"error": f"Timed out: {e}"}
         except Exception as e:
             logger.error(f"Exception when posting to query_range: {e}")
             raise e
@@ -385,35 +553,30 @@ class SignozApiProcessor(Processor):
         Returns a dict with panel results.
         """
         # Use standardized time range logic
-        start_dt, end_dt = self._get_time_range(start_time, end_time, duration, default_hours=3)
-        from_time = int(start_dt.timestamp() * 1000)
-        to_time = int(end_dt.timestamp() * 1000)
+        from_time, to_time = self._get_time_range_ms(start_time, end_time, duration, default_hours=3)
         try:
-            dashboards = self.fetch_dashboards()
-            if not dashboards or "data" not in dashboards:
-                return {"status": "error", "message": "No dashboards found"}
-            dashboard_id = None
-            for d in dashboards["data"]:
-                dashboard_data = d.get("data", {})
-                if dashboard_data.get("title") == dashboard_name:
-                    dashboard_id = d.get("id")
-                    break
-            if not dashboard_id:
-                return {"status": "error", "message": f"Dashboard '{dashboard_name}' not found"}
-            dashboard_details = self.fetch_dashboard_details(dashboard_id)
-            if not dashboard_details:
-                return {"status": "error", "message": f"Dashboard details not found for '{dashboard_name}'"}
+            dashboard_details = self._fetch_known_dashboard_details(dashboard_name)
+            if dashboard_details is None:
+                dashboards = self.fetch_dashboards()
+                if not dashboards or "data" not in dashboards:
+                    return {"status": "error", "message": "No dashboards found"}
+                dashboard_id = self._find_dashboard_id(dashboards, dashboard_name)
+                if not dashboard_id:
+                    return {"status": "error", "message": f"Dashboard '{dashboard_name}' not found"}
+                dashboard_details = self.fetch_dashboard_details(dashboard_id)
+                if not dashboard_details:
+                    return {"status": "error", "message": f"Dashboard details not found for '{dashboard_name}'"}
             # Panels are nested under 'data' in the dashboard details
             panels = dashboard_details.get("data", {}).get("widgets", [])
-            print(f"dashboard_details: {dashboard_details.get('data', {})}")
-            print(f"panels: {panels}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Dashboard '%s' has %d panels", dashboard_name, len(panels))
             if not panels:
                 return {"status": "error", "message": f"No panels found in dashboard '{dashboard_name}'"}
             # Parse variables
             variables = {}
             if variables_json:
                 try:
-                    variables = json.loads(variables_json)
+                    variables = orjson.loads(variables_json)
                     if not isinstance(variables, dict):
                         variables = {}
                 except Exception:
@@ -421,8 +584,10 @@ class SignozApiProcessor(Processor):
             # Step
             global_step = step if step is not None else 60
             query_builder = SignozDashboardQueryBuilder(global_step, variables)
-            panel_results = {}
-            print(f"panels: {panels}")
+            # (title, result) pairs in panel order; entries for panels with queries are filled in once their POSTs finish
+            panel_entries = []
+            pending_entries = []
+            pending_payloads = []
             for panel in panels:
                 panel_title = panel.get("title") or f"Panel_{panel.get('id', '')}"
                 panel_type = panel.get("panelTypes") or panel.get("panelType") or panel.get("type") or "graph"
@@ -436,27 +601,42 @@ class SignozApiProcessor(Processor):
                 ):
                     queries = panel["query"]["builder"]["queryData"]
                 if not queries:
-                    panel_results[panel_title] = {"status": "skipped", "message": "No builder queries in panel"}
+                    panel_entries.append((panel_title, {"status": "skipped", "message": "No builder queries in panel"}))
+                    continue
+                queries = [query_data for query_data in queries if isinstance(query_data, dict)]
+                if len(queries) > MAX_BUILDER_QUERIES:
+                    message = f"Panel has {len(queries)} builder queries; at most {MAX_BUILDER_QUERIES} (A-Z) are supported"
+                    panel_entries.append((panel_title, {"status": "error", "message": message}))
                     continue
+                query_builder.begin_panel()
                 built_queries = {}
                 for query_data in queries:
-                    if not isinstance(query_data, dict):
-                        continue
                     letter, query_dict = query_builder.build_query_dict(query_data)
                     built_queries[letter] = query_dict
                 if not built_queries:
-                    panel_results[panel_title] = {"status": "skipped", "message": "No valid builder queries in panel"}
+                    panel_entries.append((panel_title, {"status": "skipped", "message": "No valid builder queries in panel"}))
                     continue
-                payload = query_builder.build_panel_payload(panel_type, built_queries, from_time, to_time)
-                try:
-                    result = self._post_query_range(payload)
-                    panel_results[panel_title] = {"status": "success", "data": result}
-                except Exception as e:
-                    panel_results[panel_title] = {"status": "error", "message": str(e)}
+                entry = [panel_title, None]
+                panel_entries.append(entry)
+                pending_entries.append(entry)
+                pending_payloads.append(query_builder.build_panel_payload(panel_type, built_queries, from_time, to_time))
+            if pending_payloads:
+                # Each panel is an independent round-trip to Signoz, so they are issued concurrently
+                with ThreadPoolExecutor(max_workers=min(MAX_PANEL_WORKERS, len(pending_payloads))) as executor:
+                    for entry, result in zip(pending_entries, executor.map(self._post_panel_query, pending_payloads)):
+                        entry[1] = result
+            # Later panels with a duplicate title replace earlier ones, as before
+            panel_results = dict(panel_entries)
             return {"status": "success", "dashboard": dashboard_name, "results": panel_results}
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    def _post_panel_query(self, payload):
+        try:
+            return {"status": "success", "data": self._post_query_range(payload)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
     def fetch_apm_metrics(self, service_name, start_time=None, end_time=None, window="1m", operation_names=None, metrics=None, duration=None):
         """
         Fetches standard APM metrics for a given service and time range using hardcoded builder query templates.
@@ -464,57 +644,33 @@ class SignozApiProcessor(Processor):
         If duration is provided, uses that as the window ending at now. If start_time and end_time are provided, uses those. Defaults to last 3 hours.
         """
         # Use standardized time range logic
-        start_dt, end_dt = self._get_time_range(start_time, end_time, duration, default_hours=3)
-        from_time = int(start_dt.timestamp() * 1000)
-        to_time = int(end_dt.timestamp() * 1000)
+        from_time, to_time = self._get_time_range_ms(start_time, end_time, duration, default_hours=3)
         step_val = self._parse_step(window)
         if not metrics:
             metrics = ["request_rate", "error_rate", "latency_avg"]
+        # latency_avg takes two letters (sum and count); its C/D-style average query is named after them
+        letters_needed = sum(2 if metric_key == "latency_avg" else metric_key in APM_METRIC_QUERIES for metric_key in metrics)
+        if letters_needed > MAX_BUILDER_QUERIES:
+            return {"error": f"Too many metrics requested; they need {letters_needed} builder queries, at most {MAX_BUILDER_QUERIES} are supported"}
+        # The service/operation filter is the same for every query in the request, so it is built once and shared
+        filter_items = [{"key": _SERVICE_NAME_FILTER_KEY, "op": "IN", "value": [service_name]}]
+        if operation_names:
+            filter_items.append({"key": _OPERATION_FILTER_KEY, "op": "IN", "value": operation_names})
+        filters = {"items": filter_items, "op": "AND"}
         builder_queries = {}
-        query_name_counter = 65  # ASCII 'A'
+        query_letters = _query_letters()
         for metric_key in metrics:
             if metric_key == "latency_avg":
-                # Add sum, count, and avg queries for latency
-                for subkey, template in APM_METRIC_QUERIES["latency"].items():
-                    import copy
-
-                    q = copy.deepcopy(template)
-                    q["stepInterval"] = step_val
-                    # Fill filters
-                    filters = [
-                        {
-                            "key": {"key": "service.name", "dataType": "string", "isColumn": False, "type": "resource"},
-                            "op": "IN",
-                            "value": [service_name],
-                        }
-                    ]
-                    if operation_names:
-                        filters.append(
-                            {
-                                "key": {"key": "operation", "dataType": "string", "isColumn": False, "type": "tag"},
-                                "op": "IN",
-                                "value": operation_names,
-                            }
-                        )
-                    if subkey in ("sum", "count"):
-                        q["filters"] = {"items": filters, "op": "AND"}
-                    q["queryName"] = q.get("expression")  # Use C, D, or C/D
+                # Add sum, count, and avg queries for latency; the avg query divides sum by count and is named e.g. C/D
+                latency_templates = APM_METRIC_QUERIES["latency"]
+                sum_query = _build_apm_query(latency_templates["sum"], step_val, filters, next(query_letters))
+                count_query = _build_apm_query(latency_templates["count"], step_val, filters, next(query_letters))
+                avg_name = f"{sum_query['queryName']}/{count_query['queryName']}"
+                avg_query = _build_apm_query(latency_templates["avg"], step_val, latency_templates["avg"]["filters"], avg_name)
+                for q in (sum_query, count_query, avg_query):
                     builder_queries[q["queryName"]] = q
             elif metric_key in APM_METRIC_QUERIES:
-                import copy
-
-                q = copy.deepcopy(APM_METRIC_QUERIES[metric_key])
-                q["stepInterval"] = step_val
-                filters = [
-                    {"key": {"key": "service.name", "dataType": "string", "isColumn": False, "type": "resource"}, "op": "IN", "value": [service_name]}
-                ]
-                if operation_names:
-                    filters.append(
-                        {"key": {"key": "operation", "dataType": "string", "isColumn": False, "type": "tag"}, "op": "IN", "value": operation_names}
-                    )
-                q["filters"] = {"items": filters, "op": "AND"}
-                q["queryName"] = chr(query_name_counter)
-                query_name_counter += 1
+                q = _build_apm_query(APM_METRIC_QUERIES[metric_key], step_val, filters, next(query_letters))
                 builder_queries[q["queryName"]] = q
         payload = {
             "start": from_time,
@@ -1,15 +1,26 @@
-import json
 import sys
 from time import sleep
 
+import orjson
+
+
+def _write_message(stdout, message):
+    # Each response is flushed right away: the client waits for it before sending the next request
+    # Structured tool results may carry integer keys, which orjson only encodes when asked to stringify them
+    stdout.write(orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+    stdout.flush()
+
 
 def run_stdio_server(handler):
     """
     Reads JSON-RPC requests from stdin, calls the handler, and writes responses to stdout.
-    The handler should be a function that takes a dict and returns a dict (the response).
+    The handler takes the decoded message (a dict, or a list for a batch) and returns the response, or None when no response is due.
+    Messages are read and written as raw bytes so orjson never needs an intermediate str.
     """
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
     while True:
-        line = sys.stdin.readline()
+        line = stdin.readline()
         if not line:
             print("No line read", file=sys.stderr)
             sleep(1)
@@ -18,10 +29,14 @@ def run_stdio_server(handler):
         if not line:
             continue
         try:
-            data = json.loads(line)
+            data = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            _write_message(stdout, {"jsonrpc": "2.0", "error": {"code": -32700, "message": "Parse error"}, "id": None})
+            continue
+        try:
             response = handler(data)
-            sys.stdout.write(json.dumps(response) + "\n")
-            sys.stdout.flush()
         except Exception as e:
-            sys.stdout.write(json.dumps({"jsonrpc": "2.0", "error": {"code": -32000, "message": str(e)}, "id": None}) + "\n")
-            sys.stdout.flush()
+            _write_message(stdout, {"jsonrpc": "2.0", "error": {"code": -32000, "message": str(e)}, "id": None})
+            continue
+        if response is not None:
+            _write_message(stdout, response)
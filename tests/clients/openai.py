@@ -1,8 +1,47 @@
-import json
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
+import orjson
 from openai import OpenAI
 from tests.clients.signoz import SignozMCPClient
+from tests.utils import write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+# Shared by every tool that declares no parameters
+_DEFAULT_TOOL_PARAMETERS = {"type": "object", "properties": {}}
+# Tool calls of one turn that may run on the MCP server at the same time
+MAX_TOOL_WORKERS = 8
+# The SDK retries rate limits, connection errors and 5xx responses itself, with exponential backoff and jitter
+OPENAI_MAX_RETRIES = 3
+
+
+class RequestRateLimiter:
+    """Blocks until a request fits within max_requests over the trailing window (in seconds)."""
+
+    def __init__(self, max_requests: int, window: float = 60.0):
+        self.max_requests = max_requests
+        self.window = window
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= self.window:
+                    self._sent.popleft()
+                if len(self._sent) < self.max_requests:
+                    self._sent.append(now)
+                    return
+                wait = self.window - (now - self._sent[0])
+            time.sleep(wait)
 
 
 class OpenAIMCPClient:
@@ -11,95 +50,188 @@ class OpenAIMCPClient:
         test_client: Any,
         openai_api_key: Optional[str],
         mcp_api_key: str = "test-key",
+        response_cache_dir: Optional[str] = None,
+        max_requests_per_minute: Optional[int] = None,
     ):
         """
         Initialize the OpenAI-MCP Client for testing.
+        With response_cache_dir set, chat() replies are stored there keyed on model, messages and options, and replayed on later runs.
+        With max_requests_per_minute set, OpenAI completions wait as needed to stay under that rate.
         """
         if not openai_api_key:
             raise ValueError("OpenAI API key must be provided for testing.")
 
-        self.openai_client = OpenAI(api_key=openai_api_key)
+        self.openai_client = OpenAI(api_key=openai_api_key, max_retries=OPENAI_MAX_RETRIES)
         self.mcp_client = SignozMCPClient(
             test_client=test_client, api_key=mcp_api_key
         )
         self.mcp_tools = self._get_mcp_tools()
+        self.response_cache_dir = response_cache_dir
+        self.rate_limiter = (
+            RequestRateLimiter(max_requests_per_minute) if max_requests_per_minute else None
+        )
 
     def _get_mcp_tools(self):
         """Fetch and format tools from the MCP server."""
         try:
             mcp_tools_raw = self.mcp_client.list_tools()
-            formatted_tools = []
-            for tool in mcp_tools_raw:
-                tool_name = tool.get("name")
-                if isinstance(tool_name, str):
-                    formatted_tools.append(
-                        {
-                            "type": "function",
-                            "function": {
-                                "name": tool_name,
-                                "description": tool.get("description"),
-                                "parameters": tool.get(
-                                    "parameters", {"type": "object", "properties": {}}
-                                ),
-                            },
-                        }
-                    )
-            return formatted_tools
+            return [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": tool["name"],
+                        "description": tool.get("description"),
+                        "parameters": tool.get("inputSchema")
+                        or tool.get("parameters")
+                        or _DEFAULT_TOOL_PARAMETERS,
+                    },
+                }
+                for tool in mcp_tools_raw
+                if isinstance(tool.get("name"), str)
+            ]
         except Exception as e:
-            print(f"Failed to fetch or format MCP tools: {e}")
+            logger.warning("Failed to fetch or format MCP tools: %s", e)
             return []
 
+    def _run_tool(self, name: str, arguments: str):
+        """Execute one tool call from its streamed JSON arguments, turning any failure into an error payload."""
+        try:
+            return self.mcp_client.execute_tool(
+                tool_name=name, parameters=orjson.loads(arguments or "{}")
+            )
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _response_cache_path(self, messages: list, model: str, kwargs: dict) -> str:
+        # Prompts differing only in case or whitespace share a reply; a change to the tool schemas invalidates it
+        normalized_messages = [
+            {**message, "content": " ".join(message["content"].lower().split())}
+            if isinstance(message.get("content"), str)
+            else message
+            for message in messages
+        ]
+        key = orjson.dumps(
+            {
+                "model": model,
+                "tools": self.mcp_tools,
+                "messages": normalized_messages,
+                "kwargs": kwargs,
+            },
+            option=orjson.OPT_SORT_KEYS,
+            default=str,
+        )
+        return os.path.join(
+            self.response_cache_dir, hashlib.sha256(key).hexdigest() + ".json"
+        )
+
     def chat(self, messages: list, model: str = "gpt-4o", **kwargs):
         """
-        Send a chat request to OpenAI, handling MCP tool calls. Only non-streaming mode is supported: returns the full response as a string.
+        Send a chat request to OpenAI, handling MCP tool calls. Returns the full response as a string.
+        Cached replies are returned without calling OpenAI or the MCP server; messages is then left unchanged.
+        """
+        if not self.response_cache_dir:
+            return self._chat(messages, model, **kwargs)
+        cache_path = self._response_cache_path(messages, model, kwargs)
+        try:
+            with open(cache_path, "rb") as f:
+                return orjson.loads(f.read())["content"]
+        except (OSError, orjson.JSONDecodeError, KeyError):
+            pass
+        content = self._chat(messages, model, **kwargs)
+        write_file_atomic(cache_path, orjson.dumps({"content": content}))
+        return content
+
+    def _create_completion(self, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self.openai_client.chat.completions.create(**kwargs)
+
+    def _chat(self, messages: list, model: str, **kwargs):
+        """
+        Run one chat turn against OpenAI.
+        The first completion is streamed so each tool call starts on the MCP server as soon as its arguments are complete.
         """
-        completion = self.openai_client.chat.completions.create(
+        completion = self._create_completion(
             model=model,
             messages=messages,
             tools=self.mcp_tools,
             tool_choice="auto",
-            stream=False,
+            stream=True,
             temperature=0,
             **kwargs,
         )
-        content = ""
-        tool_calls = None
-        for choice in completion.choices:
-            if hasattr(choice, "message") and choice.message:
-                if choice.message.content:
-                    content += choice.message.content
-                if hasattr(choice.message, "tool_calls") and choice.message.tool_calls:
-                    tool_calls = choice.message.tool_calls
-        if not tool_calls:
-            return content
-        # If there are tool calls, execute them and get the final response
-        messages.append({"role": "assistant", "tool_calls": [tc.to_dict() for tc in tool_calls]})
-        for tool_call in tool_calls:
-            function_name = tool_call.function.name
-            function_args = json.loads(tool_call.function.arguments)
-            try:
-                tool_result = self.mcp_client.execute_tool(
-                    tool_name=function_name, parameters=function_args
-                )
-            except Exception as e:
-                tool_result = {"error": str(e)}
+        content_parts = []
+        tool_calls = {}
+        futures = {}
+        with ThreadPoolExecutor(max_workers=MAX_TOOL_WORKERS) as executor:
+            for chunk in completion:
+                for choice in chunk.choices:
+                    delta = choice.delta
+                    if delta is None:
+                        continue
+                    if delta.content:
+                        content_parts.append(delta.content)
+                    for tool_call_delta in delta.tool_calls or ():
+                        call = tool_calls.setdefault(
+                            tool_call_delta.index, {"id": None, "name": "", "arguments": ""}
+                        )
+                        if tool_call_delta.id:
+                            call["id"] = tool_call_delta.id
+                        function = tool_call_delta.function
+                        if function is not None:
+                            call["name"] += function.name or ""
+                            call["arguments"] += function.arguments or ""
+                        if tool_call_delta.index in futures or not call["name"]:
+                            continue
+                        # A JSON object cannot be extended once it parses, so the call is complete
+                        try:
+                            orjson.loads(call["arguments"])
+                        except orjson.JSONDecodeError:
+                            continue
+                        futures[tool_call_delta.index] = executor.submit(
+                            self._run_tool, call["name"], call["arguments"]
+                        )
+            if not tool_calls:
+                return "".join(content_parts)
+            # Calls whose arguments never parsed (e.g. empty) run once the stream has ended
+            for index, call in tool_calls.items():
+                if index not in futures:
+                    futures[index] = executor.submit(
+                        self._run_tool, call["name"], call["arguments"]
+                    )
+            ordered = sorted(tool_calls.items())
             messages.append(
                 {
-                    "tool_call_id": tool_call.id,
-                    "role": "tool",
-                    "name": function_name,
-                    "content": json.dumps(tool_result),
+                    "role": "assistant",
+                    "tool_calls": [
+                        {
+                            "id": call["id"],
+                            "type": "function",
+                            "function": {"name": call["name"], "arguments": call["arguments"]},
+                        }
+                        for _, call in ordered
+                    ],
                 }
             )
+            for index, call in ordered:
+                messages.append(
+                    {
+                        "tool_call_id": call["id"],
+                        "role": "tool",
+                        "name": call["name"],
+                        "content": orjson.dumps(futures[index].result()).decode(),
+                    }
+                )
         # Get the final response after tool call(s)
-        completion2 = self.openai_client.chat.completions.create(
+        completion2 = self._create_completion(
             model=model, messages=messages, stream=False, temperature=0, **kwargs
         )
-        final_content = ""
-        for choice in completion2.choices:
-            if hasattr(choice, "message") and choice.message and choice.message.content:
-                final_content += choice.message.content
-        print("final_content", final_content)
+        final_content = "".join(
+            message.content
+            for message in (getattr(choice, "message", None) for choice in completion2.choices)
+            if message is not None and message.content
+        )
+        logger.debug("final_content %s", final_content)
         return final_content
 
     def close(self):
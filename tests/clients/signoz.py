@@ -1,33 +1,78 @@
-import json
-import uuid
-from typing import Any, Dict, List
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 
 
 class SignozMCPClient:
-    def __init__(self, test_client: Any, api_key: str = "test-key"):
+    def __init__(
+        self,
+        test_client: Any = None,
+        api_key: str = "test-key",
+        base_url: Optional[str] = None,
+    ):
+        """
+        Talks to the MCP server through a Flask test client, or over HTTP when
+        base_url is given. The HTTP path keeps one pooled keep-alive session.
+        """
+        if test_client is None and not base_url:
+            raise ValueError("Either test_client or base_url must be provided.")
         self.test_client = test_client
         self.api_key = api_key
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self._http = None
+        if test_client is None:
+            self._http = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=20)
+            self._http.mount("http://", adapter)
+            self._http.mount("https://", adapter)
+            self._http.headers.update(
+                {
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json",
+                }
+            )
+        self._tools_cache = None
+        # JSON-RPC ids only need to be unique per client; next() on a count is atomic under the GIL
+        self._id_counter = itertools.count(1)
         self._initialize()
 
-    def _handle_response(self, response):
-        """Handle Flask's test response."""
-        result = response.get_json()
-        if response.status_code >= 400:
+    def _new_id(self) -> str:
+        return str(next(self._id_counter))
+
+    def _handle_response(self, response: Tuple[int, bytes]):
+        """Decode a (status code, body) pair from the server."""
+        status_code, body = response
+        result = orjson.loads(body)
+        if status_code >= 400:
             error_message = result.get("error", {}).get("message", str(result))
             raise Exception(
-                f"Request failed with status {response.status_code}: {error_message}"
+                f"Request failed with status {status_code}: {error_message}"
             )
         return result
 
+    def _post(self, payload: Any) -> Tuple[int, bytes]:
+        """POST a JSON-RPC message (or batch) to the MCP endpoint, encoded with orjson."""
+        data = orjson.dumps(payload)
+        if self._http is not None:
+            response = self._http.post(f"{self.base_url}/mcp", data=data)
+            return response.status_code, response.content
+        response = self.test_client.post(
+            "/mcp", data=data, content_type="application/json"
+        )
+        return response.status_code, response.get_data()
+
     def _initialize(self):
         """Initialize the MCP session."""
         payload = {
             "jsonrpc": "2.0",
             "method": "initialize",
             "params": {"protocolVersion": "2025-06-18"},
-            "id": str(uuid.uuid4()),
+            "id": self._new_id(),
         }
-        response = self.test_client.post("/mcp", json=payload)
+        response = self._post(payload)
         result = self._handle_response(response)
         if "error" in result:
             raise Exception(f"Initialization failed: {result['error']}")
@@ -38,9 +83,9 @@ class SignozMCPClient:
             "jsonrpc": "2.0",
             "method": method,
             "params": params,
-            "id": str(uuid.uuid4()),
+            "id": self._new_id(),
         }
-        response = self.test_client.post("/mcp", json=payload)
+        response = self._post(payload)
         result = self._handle_response(response)
         if "error" in result:
             raise Exception(
@@ -48,22 +93,90 @@ class SignozMCPClient:
             )
         return result["result"]
 
+    def _send_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Send several JSON-RPC requests in one POST.
+
+        Returns the response message for each call, in call order.
+        """
+        payload = [
+            {"jsonrpc": "2.0", "method": method, "params": params, "id": self._new_id()}
+            for method, params in calls
+        ]
+        response = self._post(payload)
+        result = self._handle_response(response)
+        responses_by_id = {message.get("id"): message for message in result}
+        return [
+            responses_by_id.get(
+                request["id"],
+                {"error": {"message": f"No response for request {request['id']}"}},
+            )
+            for request in payload
+        ]
+
     def list_tools(self) -> List[Dict[str, Any]]:
-        """Fetch and format tools from the MCP server."""
-        result = self._send_request("tools/list", {})
-        return result.get("tools", [])
+        """Fetch and format tools from the MCP server.
+
+        The tool list is static for a server, so it is fetched once per client;
+        call refresh_tools() to fetch it again.
+        """
+        if self._tools_cache is None:
+            result = self._send_request("tools/list", {})
+            self._tools_cache = result.get("tools", [])
+        return self._tools_cache
+
+    def refresh_tools(self) -> List[Dict[str, Any]]:
+        """Drop the cached tool list and fetch it again from the MCP server."""
+        self._tools_cache = None
+        return self.list_tools()
 
     def execute_tool(
         self, tool_name: str, parameters: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Execute a tool on the MCP server."""
-        params = {"name": tool_name, "arguments": parameters}
-        result = self._send_request("tools/call", params)
+        result = self.execute_tools_batch([(tool_name, parameters)])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def execute_tools_batch(
+        self, calls: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Any]:
+        """Execute several tools on the MCP server in a single JSON-RPC batch.
+
+        Returns one entry per call, in call order: the tool result, or the
+        Exception describing why that call failed.
+        """
+        messages = self._send_batch(
+            [
+                (
+                    "tools/call",
+                    {
+                        "name": tool_name,
+                        "arguments": parameters,
+                        "responseFormat": "structured",
+                    },
+                )
+                for tool_name, parameters in calls
+            ]
+        )
+        return [self._tool_result(message) for message in messages]
+
+    @staticmethod
+    def _tool_result(message: Dict[str, Any]) -> Any:
+        if "error" in message:
+            return Exception(
+                f"API call failed for method tools/call: {message['error']['message']}"
+            )
+        result = message["result"]
+        if "structuredContent" in result:
+            return result["structuredContent"]
         content = result.get("content", [])
         if content and isinstance(content, list) and "text" in content[0]:
-            return json.loads(content[0]["text"])
+            return orjson.loads(content[0]["text"])
         return result
 
     def close_session(self):
-        """No-op for test client."""
-        pass 
\ No newline at end of file
+        """Close the pooled HTTP session; a no-op for the test client."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
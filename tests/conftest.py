@@ -1,32 +1,58 @@
+import functools
 import pytest
 import yaml
 from signoz_mcp_server.processor.signoz_processor import SignozApiProcessor
 import os
 from typing import Any, List, Optional
 
+from tests.clients.openai import OpenAIMCPClient
+from tests.clients.signoz import SignozMCPClient
 # Import our evaluation utilities
 from tests.utils import SignozResponseEvaluator
 
 
+CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "../src/signoz_mcp_server/config.yaml"
+)
+
+@functools.lru_cache(maxsize=1)
+def _load_config():
+    """
+    Parses config.yaml once per session; returns {} when it is missing or malformed.
+    """
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        with open(CONFIG_PATH) as f:
+            return yaml.load(f, Loader=loader) or {}
+    except (OSError, yaml.YAMLError):
+        return {}
+
+def _openai_api_key():
+    """
+    The OpenAI API key from config.yaml, else from OPENAI_API_KEY; None when neither is set.
+    """
+    return (_load_config().get("openai") or {}).get("api_key") or os.environ.get("OPENAI_API_KEY")
+
 @pytest.fixture(scope="session")
 def signoz_config():
     """
     Loads the Signoz configuration from the YAML file.
     """
-    with open("src/signoz_mcp_server/config.yaml", "r") as f:
-        config = yaml.safe_load(f)
-    return config['signoz']
+    return _load_config()['signoz']
 
 @pytest.fixture(scope="session")
 def signoz_processor(signoz_config):
     """
     Provides a SignozApiProcessor instance configured for live API testing.
     """
-    return SignozApiProcessor(
+    processor = SignozApiProcessor(
         signoz_host=signoz_config["host"],
         signoz_api_key=signoz_config.get("api_key"),
         ssl_verify=str(signoz_config.get("ssl_verify", "true"))
     )
+    yield processor
+    processor.close()
 
 @pytest.fixture(scope="session")
 def app():
@@ -37,26 +63,50 @@ def app():
     flask_app.config.update({"TESTING": True})
     return flask_app
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def client(app):
-    """A test client for the app."""
+    """A test client for the app, shared by every test in the session."""
     return app.test_client()
 
 @pytest.fixture(scope="session")
-def openai_api_key():
-    """Fixture to get the OpenAI API key."""
-    config_path = os.path.join(
-        os.path.dirname(__file__), "../src/signoz_mcp_server/config.yaml"
+def signoz_mcp_client(client):
+    """An initialized SignozMCPClient, shared so `initialize` and `tools/list` run once per session."""
+    return SignozMCPClient(test_client=client)
+
+@pytest.fixture(scope="session")
+def mcp_client(request, openai_api_key, client):
+    """
+    Fixture to create an OpenAIMCPClient instance for testing.
+    With MCP_CACHE_OPENAI=1, chat replies are cached under .pytest_cache so reruns skip OpenAI.
+    OPENAI_MAX_RPM caps the completions this worker sends per minute.
+    """
+    response_cache_dir = None
+    cache = getattr(request.config, "cache", None)
+    if os.environ.get("MCP_CACHE_OPENAI") == "1" and cache is not None:
+        response_cache_dir = str(cache.mkdir("openai"))
+
+    mcp_client_instance = OpenAIMCPClient(
+        test_client=client,
+        openai_api_key=openai_api_key,
+        response_cache_dir=response_cache_dir,
+        max_requests_per_minute=int(os.environ.get("OPENAI_MAX_RPM") or 0) or None,
     )
-    config = {}
-    if os.path.exists(config_path):
-        try:
-            with open(config_path) as f:
-                config = yaml.safe_load(f)
-        except yaml.YAMLError:
-            pass  # Ignore malformed config
-    print("config", config)
-    key = config.get("openai", {}).get("api_key") if config else None
+    yield mcp_client_instance
+    mcp_client_instance.close()
+
+@pytest.fixture(scope="session")
+def dashboards(signoz_mcp_client):
+    """The dashboards listed by the 'fetch_dashboards' tool, fetched once per session."""
+    content = signoz_mcp_client.execute_tool("fetch_dashboards", {})
+    assert content["status"] == "success"
+    return content["data"]["data"]
+
+@pytest.fixture(scope="session")
+def openai_api_key():
+    """Fixture to get the OpenAI API key, also exported as OPENAI_API_KEY when not already set."""
+    key = _openai_api_key()
+    if key:
+        os.environ.setdefault("OPENAI_API_KEY", key)
     return key
 
 @pytest.fixture(scope="module")
@@ -69,24 +119,29 @@ def evaluator(openai_api_key):
         pytest.skip("OpenAI API key required for evaluation")
     
     # Use gpt-4o-mini for cost-effective testing
-    return SignozResponseEvaluator(model="gpt-4o-mini")
-
-@pytest.fixture(scope="session", autouse=True)
-def setup_environment():
-    """Setup environment for testing."""
-
-    config_path = "src/signoz_mcp_server/config.yaml"
-    if os.path.exists(config_path):
-        try:
-            with open(config_path) as f:
-                config = yaml.safe_load(f)
-                openai_key = config.get("openai", {}).get("api_key")
-                if openai_key:
-                    os.environ["OPENAI_API_KEY"] = openai_key
-        except yaml.YAMLError:
-            pass
-
-    yield
+    evaluator_instance = SignozResponseEvaluator(model="gpt-4o-mini")
+    yield evaluator_instance
+    evaluator_instance.close()
+
+def pytest_addoption(parser):
+    """Register command line options for the test suite."""
+    parser.addoption(
+        "--service-name",
+        default=os.environ.get("SIGNOZ_TEST_SERVICE_NAME"),
+        help="Service name for the APM metrics tool test; defaults to guessing one from dashboard titles",
+    )
+    parser.addoption(
+        "--full-paraphrases",
+        action="store_true",
+        default=False,
+        help="Also run the tests marked paraphrase, which repeat a query in other words",
+    )
+    parser.addoption(
+        "--cache-signoz",
+        action="store_true",
+        default=False,
+        help="Reuse the SigNoz dashboard listing saved in .pytest_cache by an earlier run",
+    )
 
 # Custom pytest markers for pass rate functionality
 def pytest_configure(config):
@@ -101,34 +156,45 @@ def pytest_configure(config):
 # Track test results for pass rate calculation
 _test_results = {}
 
+def pytest_collection_modifyitems(config, items):
+    """Copy each pass_rate marker onto the item's user_properties.
+
+    Reports only carry user_properties, not the item, and they survive the trip
+    from pytest-xdist workers to the controller, so pass rates also work with -n.
+    Tests marked paraphrase are deselected unless --full-paraphrases is given.
+    """
+    if not config.getoption("--full-paraphrases"):
+        deselected = [item for item in items if item.get_closest_marker("paraphrase")]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if not item.get_closest_marker("paraphrase")]
+    for item in items:
+        pass_rate_marker = item.get_closest_marker('pass_rate')
+        if pass_rate_marker:
+            required_rate = pass_rate_marker.args[0] if pass_rate_marker.args else 0.8
+            item.user_properties.append(('pass_rate', required_rate))
+
 def pytest_runtest_logreport(report):
     """Collect test results for pass rate calculation."""
     if report.when == "call":
-        test_id = report.nodeid
-        
-        # Extract pass_rate marker if present from the test item
-        if hasattr(report, 'item') and hasattr(report.item, 'iter_markers'):
-            pass_rate_marker = None
-            for marker in report.item.iter_markers('pass_rate'):
-                pass_rate_marker = marker
-                break
-            
-            if pass_rate_marker:
-                required_rate = pass_rate_marker.args[0] if pass_rate_marker.args else 0.8
-                
-                # Initialize tracking for this test group
-                base_test_name = test_id.split('[')[0]  # Remove parametrization
-                if base_test_name not in _test_results:
-                    _test_results[base_test_name] = {
-                        'required_rate': required_rate,
-                        'results': []
-                    }
-                
-                # Record result
-                _test_results[base_test_name]['results'].append(report.outcome == 'passed')
+        required_rate = dict(report.user_properties).get('pass_rate')
+        if required_rate is not None:
+            # Initialize tracking for this test group
+            base_test_name = report.nodeid.split('[', 1)[0]  # Remove parametrization
+            if base_test_name not in _test_results:
+                _test_results[base_test_name] = {
+                    'required_rate': required_rate,
+                    'results': []
+                }
+
+            # Record result
+            _test_results[base_test_name]['results'].append(report.outcome == 'passed')
 
 def pytest_sessionfinish(session, exitstatus):
     """Check pass rates at the end of the session."""
+    if hasattr(session.config, "workerinput"):
+        # pytest-xdist worker: the controller receives every report and does the check
+        return
     for test_name, data in _test_results.items():
         results = data['results']
         required_rate = data['required_rate']
@@ -146,13 +212,15 @@ def assert_response_quality(
     evaluator: Any,
     min_pass_rate: float = 0.8,
     specific_checks: Optional[List[str]] = None,
-    required_checks: Optional[List[str]] = None
+    required_checks: Optional[List[str]] = None,
+    scores: bool = False,
 ) -> None:
     """
     Assert response quality using LLM evaluation.
     
     This is a convenience function that can be used in tests to evaluate
-    response quality with multiple criteria.
+    response quality with multiple criteria. With scores=True the pass rate
+    is the mean of the judge's confidences rather than of pass/fail verdicts.
     """
     if evaluator is None:
         pytest.skip("Evaluator not available")
@@ -163,7 +231,8 @@ def assert_response_quality(
         prompt=prompt,
         response=response, 
         evaluator=evaluator,
-        specific_checks=specific_checks
+        specific_checks=specific_checks,
+        scores=scores,
     )
     
     assert_evaluation_passes(
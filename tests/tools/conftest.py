@@ -1,4 +1,119 @@
+import os
+from urllib.parse import urlparse
+
+import orjson
 import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from tests.conftest import _load_config
 
 # Mark all tests in this file as 'tools'
-pytestmark = pytest.mark.tools 
\ No newline at end of file
+pytestmark = pytest.mark.tools
+
+# Set SIGNOZ_LIVE=1 to run the tool tests against the SigNoz host from config.yaml
+SIGNOZ_LIVE = os.environ.get("SIGNOZ_LIVE") == "1"
+FAKE_SIGNOZ_HOST = "http://signoz.test"
+
+FAKE_DASHBOARD_ID = "fake-dashboard-1"
+FAKE_DASHBOARD_TITLE = "Python Microservices Service Overview"
+FAKE_DASHBOARD = {
+    "id": FAKE_DASHBOARD_ID,
+    "data": {
+        "title": FAKE_DASHBOARD_TITLE,
+        "widgets": [
+            {
+                "title": "Total Calls",
+                "panelTypes": "graph",
+                "query": {
+                    "queryType": "builder",
+                    "builder": {
+                        "queryData": [
+                            {
+                                "dataSource": "metrics",
+                                "aggregateOperator": "sum_rate",
+                                "aggregateAttribute": {"key": "signoz_calls_total"},
+                                "stepInterval": 60,
+                                "groupBy": [],
+                            }
+                        ]
+                    },
+                },
+            }
+        ],
+    },
+}
+FAKE_SERVICES = [
+    {"serviceName": "Recommendation Service", "p99": 1.2e8, "callRate": 2.5, "errorRate": 0.0},
+    {"serviceName": "Shipping Service", "p99": 4.0e7, "callRate": 1.1, "errorRate": 0.0},
+    {"serviceName": "Email Service", "p99": 2.0e7, "callRate": 0.4, "errorRate": 0.0},
+]
+FAKE_QUERY_RANGE = {
+    "status": "success",
+    "data": {"resultType": "", "result": [{"queryName": "A", "series": []}]},
+}
+
+
+class FakeSignozAdapter(BaseAdapter):
+    """Answers SigNoz API requests in-process with canned responses; unknown paths get a 404."""
+
+    def send(self, request, **kwargs):
+        path = urlparse(request.url).path
+        if request.method == "GET" and path == "/api/v1/health":
+            status_code, body = 200, {"status": "ok"}
+        elif request.method == "GET" and path == "/api/v1/dashboards":
+            status_code, body = 200, {"status": "success", "data": [FAKE_DASHBOARD]}
+        elif request.method == "GET" and path == f"/api/v1/dashboards/{FAKE_DASHBOARD_ID}":
+            status_code, body = 200, {"status": "success", "data": FAKE_DASHBOARD}
+        elif request.method == "POST" and path == "/api/v1/services":
+            status_code, body = 200, {"status": "success", "data": FAKE_SERVICES}
+        elif request.method == "POST" and path == "/api/v4/query_range":
+            status_code, body = 200, FAKE_QUERY_RANGE
+        else:
+            status_code, body = 404, {"status": "error", "error": f"Not found: {path}"}
+
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = orjson.dumps(body)
+        response.headers["Content-Type"] = "application/json"
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_signoz():
+    """
+    Routes requests.Session calls for the fake host to FakeSignozAdapter, unless SIGNOZ_LIVE=1.
+    SIGNOZ_HOST is pointed at a placeholder host so the server's processor is built against it.
+    """
+    if SIGNOZ_LIVE:
+        yield None
+        return
+    adapter = FakeSignozAdapter()
+    get_adapter = requests.Session.get_adapter
+
+    def get_fake_adapter(self, url):
+        if url.startswith(FAKE_SIGNOZ_HOST):
+            return adapter
+        return get_adapter(self, url)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("SIGNOZ_HOST", FAKE_SIGNOZ_HOST)
+        mp.setattr(requests.Session, "get_adapter", get_fake_adapter)
+        yield adapter
+
+
+@pytest.fixture(scope="session")
+def signoz_config(mock_signoz):
+    """
+    Loads the Signoz configuration from the YAML file, pointed at the fake host unless SIGNOZ_LIVE=1.
+    """
+    config = _load_config().get("signoz") or {}
+    if SIGNOZ_LIVE:
+        return config
+    return {**config, "host": FAKE_SIGNOZ_HOST}
@@ -0,0 +1,30 @@
+import orjson
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+@pytest.fixture(scope="module")
+def asgi_client(app):
+    """A test client for the ASGI app, imported once the Flask app has loaded its configuration."""
+    from signoz_mcp_server.asgi import app as asgi_app
+    return TestClient(asgi_app)
+
+def test_asgi_tools_list(asgi_client):
+    """
+    Tests that a JSON-RPC request within the size limit is answered.
+    """
+    response = asgi_client.post("/mcp", content=orjson.dumps({"jsonrpc": "2.0", "method": "tools/list", "id": "1"}))
+    assert response.status_code == 200
+    assert response.json()["result"]["tools"]
+
+def test_asgi_rejects_oversized_body(asgi_client):
+    """
+    Tests that a body over MAX_REQUEST_BODY_BYTES is answered with 413, whether or not its length is declared.
+    """
+    from signoz_mcp_server.mcp_server import MAX_REQUEST_BODY_BYTES
+
+    body = b" " * (MAX_REQUEST_BODY_BYTES + 1)
+    assert asgi_client.post("/mcp", content=body).status_code == 413
+    # A generator body is sent chunked, without a content-length header
+    assert asgi_client.post("/mcp", content=iter([body[:1024], body[1024:]])).status_code == 413
@@ -1,197 +1,157 @@
-import json
+import logging
+
+import orjson
 import pytest
-import time
 
-def test_tool_call_test_connection(client):
-    """
-    Tests the 'test_connection' tool call through the MCP server.
-    """
+logger = logging.getLogger(__name__)
+
+def _extract_content(response_data):
+    """Return a tools/call result: its structuredContent, or else its parsed JSON text content."""
+    result = response_data["result"]
+    if "structuredContent" in result:
+        return result["structuredContent"]
+    return orjson.loads(result["content"][0]["text"])
+
+def _call_tool(client, name, arguments, request_id):
+    """POST a tools/call request, check the JSON-RPC envelope and return the tool content."""
     response = client.post(
         "/mcp",
-        data=json.dumps({
+        data=orjson.dumps({
             "jsonrpc": "2.0",
             "method": "tools/call",
-            "params": {
-                "name": "test_connection",
-                "arguments": {}
-            },
-            "id": "1"
+            "params": {"name": name, "arguments": arguments},
+            "id": request_id
         }),
-        content_type="application/json"
+        content_type="application/json",
     )
     assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "1"
+    response_data = orjson.loads(response.get_data())
+    assert response_data["id"] == request_id
     assert "result" in response_data
-    content = json.loads(response_data["result"]["content"][0]["text"])
+    return _extract_content(response_data)
+
+def _call_tools_batch(client, calls):
+    """POST (name, arguments, request_id) tools/call requests as one JSON-RPC batch; return parsed text contents in call order."""
+    response = client.post(
+        "/mcp",
+        data=orjson.dumps([
+            {
+                "jsonrpc": "2.0",
+                "method": "tools/call",
+                "params": {"name": name, "arguments": arguments},
+                "id": request_id
+            }
+            for name, arguments, request_id in calls
+        ]),
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    responses_by_id = {message["id"]: message for message in orjson.loads(response.get_data())}
+    assert set(responses_by_id) == {request_id for _, _, request_id in calls}
+    return [_extract_content(responses_by_id[request_id]) for _, _, request_id in calls]
+
+def test_tool_call_test_connection(client):
+    """
+    Tests the 'test_connection' tool call through the MCP server.
+    """
+    content = _call_tool(client, "test_connection", {}, request_id="1")
     assert content["status"] == "success"
     assert "Successfully connected" in content["message"]
 
-def test_tool_call_fetch_dashboards(client):
+def test_tool_call_structured_response_format(client):
     """
-    Tests the 'fetch_dashboards' tool call through the MCP server.
+    Tests that responseFormat 'structured' returns the tool result as structuredContent instead of JSON text.
     """
     response = client.post(
         "/mcp",
-        data=json.dumps({
+        data=orjson.dumps({
             "jsonrpc": "2.0",
             "method": "tools/call",
-            "params": {
-                "name": "fetch_dashboards",
-                "arguments": {}
-            },
-            "id": "2"
+            "params": {"name": "test_connection", "arguments": {}, "responseFormat": "structured"},
+            "id": "26"
         }),
-        content_type="application/json"
+        content_type="application/json",
     )
     assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "2"
-    assert "result" in response_data
-    content = json.loads(response_data["result"]["content"][0]["text"])
+    result = orjson.loads(response.get_data())["result"]
+    assert result["content"] == []
+    assert result["structuredContent"]["status"] == "success"
+
+def test_tool_call_fetch_dashboards(client):
+    """
+    Tests the 'fetch_dashboards' tool call through the MCP server.
+    """
+    content = _call_tool(client, "fetch_dashboards", {}, request_id="2")
     assert content["status"] == "success"
     assert "data" in content
     assert isinstance(content["data"]["data"], list)
 
-def test_tool_call_fetch_dashboard_details(client):
+def test_tool_call_fetch_dashboard_details(client, dashboards):
     """
     Tests the 'fetch_dashboard_details' tool call through the MCP server.
     """
-    # First, get the list of dashboards to find a valid ID
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {"name": "fetch_dashboards", "arguments": {}},
-            "id": "3"
-        }),
-        content_type="application/json"
-    )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    content = json.loads(response_data["result"]["content"][0]["text"])
-    dashboards = content["data"]["data"]
+    # Use the session-wide dashboard list to find a valid ID
     assert dashboards
 
     dashboard_id = dashboards[0]["id"]
 
     # Now, fetch the details for that dashboard
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": "fetch_dashboard_details",
-                "arguments": {"dashboard_id": dashboard_id}
-            },
-            "id": "4"
-        }),
-        content_type="application/json"
+    content = _call_tool(
+        client,
+        "fetch_dashboard_details",
+        {"dashboard_id": dashboard_id},
+        request_id="4",
     )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "4"
-    content = json.loads(response_data["result"]["content"][0]["text"])
     assert content["status"] == "success"
     assert content["data"]["id"] == dashboard_id
 
-def test_tool_call_fetch_dashboard_data(client):
+def test_tool_call_fetch_dashboard_data(client, dashboards):
     """
     Tests the 'fetch_dashboard_data' tool call through the MCP server.
     """
-    # First, get the list of dashboards to find a valid name
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {"name": "fetch_dashboards", "arguments": {}},
-            "id": "6"
-        }),
-        content_type="application/json"
-    )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    content = json.loads(response_data["result"]["content"][0]["text"])
-    dashboards = content["data"]["data"]
+    # Use the session-wide dashboard list to find a valid name
     assert dashboards
 
     dashboard_name = dashboards[0]["data"]["title"]
 
     # Now, fetch the data for that dashboard
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": "fetch_dashboard_data",
-                "arguments": {"dashboard_name": dashboard_name}
-            },
-            "id": "7"
-        }),
-        content_type="application/json"
+    content = _call_tool(
+        client,
+        "fetch_dashboard_data",
+        {"dashboard_name": dashboard_name},
+        request_id="7",
     )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "7"
-    content = json.loads(response_data["result"]["content"][0]["text"])
     assert content["status"] == "success"
     assert "data" in content
 
-def test_tool_call_fetch_apm_metrics(client):
+def test_tool_call_fetch_apm_metrics(client, request):
     """
     Tests the 'fetch_apm_metrics' tool call through the MCP server.
     """
-    # First, get the list of dashboards to find a service dashboard
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {"name": "fetch_dashboards", "arguments": {}},
-            "id": "8"
-        }),
-        content_type="application/json"
-    )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    content = json.loads(response_data["result"]["content"][0]["text"])
-    dashboards = content["data"]["data"]
-    assert dashboards
-
-    service_name = None
-    for dashboard in dashboards:
-        title = dashboard.get("data", {}).get("title", "").lower()
-        if "service" in title or "application" in title:
-            # A bit of a guess, but service dashboards often have the service name in the title.
-            service_name = dashboard.get("data", {}).get("title")
-            if service_name:
-                break
+    # --service-name (or SIGNOZ_TEST_SERVICE_NAME) skips the dashboard scan below
+    service_name = request.config.getoption("--service-name")
+    if not service_name:
+        # Use the session-wide dashboard list to find a service dashboard
+        dashboards = request.getfixturevalue("dashboards")
+        assert dashboards
+        for dashboard in dashboards:
+            title = dashboard.get("data", {}).get("title", "").lower()
+            if "service" in title or "application" in title:
+                # A bit of a guess, but service dashboards often have the service name in the title.
+                service_name = dashboard.get("data", {}).get("title")
+                if service_name:
+                    break
     
     if not service_name:
         pytest.skip("Could not find a dashboard with 'service' or 'application' in the title to test APM metrics.")
 
     # Now, fetch the APM metrics for that service
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": "fetch_apm_metrics",
-                "arguments": {"service_name": service_name}
-            },
-            "id": "9"
-        }),
-        content_type="application/json"
+    content = _call_tool(
+        client,
+        "fetch_apm_metrics",
+        {"service_name": service_name},
+        request_id="9",
     )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "9"
-    content = json.loads(response_data["result"]["content"][0]["text"])
     assert content["status"] == "success"
     assert "data" in content 
 
@@ -199,27 +159,15 @@ def test_tool_call_fetch_services(client):
     """
     Tests the 'fetch_services' tool call with time parameters through the MCP server.
     """
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": "fetch_services",
-                "arguments": {
-                    "start_time": "now-1h",
-                    "end_time": "now"
-                }
-            },
-            "id": "11"
-        }),
-        content_type="application/json"
+    content = _call_tool(
+        client,
+        "fetch_services",
+        {
+            "start_time": "now-1h",
+            "end_time": "now"
+        },
+        request_id="11",
     )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "11"
-    assert "result" in response_data
-    content = json.loads(response_data["result"]["content"][0]["text"])
     
     # Check the response status
     assert content["status"] in ("success", "failed")
@@ -229,9 +177,9 @@ def test_tool_call_fetch_services(client):
         # The data should be a dict with a 'data' key containing a list of services, or a list directly
         if isinstance(content["data"], dict) and "data" in content["data"]:
             assert isinstance(content["data"]["data"], list)
-            print(f"Found {len(content['data']['data'])} services via MCP with time params")
+            logger.debug("Found %d services via MCP with time params", len(content["data"]["data"]))
         elif isinstance(content["data"], list):
-            print(f"Found {len(content['data'])} services via MCP with time params")
+            logger.debug("Found %d services via MCP with time params", len(content["data"]))
         else:
             pytest.fail(f"Unexpected data format for services list: {type(content['data'])}")
     else:
@@ -251,38 +199,26 @@ def test_tool_call_execute_clickhouse_query(client):
     # Simple Clickhouse query to test the connection and basic functionality
     test_query = "SELECT 1 as test_column"
     
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": "execute_clickhouse_query",
-                "arguments": {
-                    "query": test_query,
-                    "start_time": "now-1h",
-                    "end_time": "now",
-                    "panel_type": "table",
-                    "fill_gaps": False,
-                    "step": 60
-                }
-            },
-            "id": "12"
-        }),
-        content_type="application/json"
+    content = _call_tool(
+        client,
+        "execute_clickhouse_query",
+        {
+            "query": test_query,
+            "start_time": "now-1h",
+            "end_time": "now",
+            "panel_type": "table",
+            "fill_gaps": False,
+            "step": 60
+        },
+        request_id="12",
     )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "12"
-    assert "result" in response_data
-    content = json.loads(response_data["result"]["content"][0]["text"])
     
     # Check the response status - it could be success or error depending on the Signoz setup
     assert content["status"] in ("success", "error")
     
     if content["status"] == "success":
         assert "data" in content
-        print(f"Successfully executed Clickhouse query: {test_query}")
+        logger.debug("Successfully executed Clickhouse query: %s", test_query)
     else:
         # If it's an error, it should have a message
         assert "message" in content
@@ -324,37 +260,25 @@ def test_tool_call_execute_builder_query(client):
         }
     }
     
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": "execute_builder_query",
-                "arguments": {
-                    "builder_queries": test_builder_queries,
-                    "start_time": "now-1h",
-                    "end_time": "now",
-                    "panel_type": "table",
-                    "step": 60
-                }
-            },
-            "id": "13"
-        }),
-        content_type="application/json"
+    content = _call_tool(
+        client,
+        "execute_builder_query",
+        {
+            "builder_queries": test_builder_queries,
+            "start_time": "now-1h",
+            "end_time": "now",
+            "panel_type": "table",
+            "step": 60
+        },
+        request_id="13",
     )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "13"
-    assert "result" in response_data
-    content = json.loads(response_data["result"]["content"][0]["text"])
     
     # Check the response status - it could be success or error depending on the Signoz setup
     assert content["status"] in ("success", "error")
     
     if content["status"] == "success":
         assert "data" in content
-        print(f"Successfully executed builder query")
+        logger.debug("Successfully executed builder query")
     else:
         # If it's an error, it should have a message
         assert "message" in content
@@ -365,105 +289,165 @@ def test_tool_call_execute_builder_query(client):
             # Other errors should fail the test
             pytest.fail(f"Unexpected error in execute_builder_query: {content.get('message', 'Unknown error')}") 
 
-def test_tool_call_fetch_traces_or_logs_traces(client):
+@pytest.mark.parametrize("data_type,request_id", [("traces", "14"), ("logs", "15")])
+def test_tool_call_fetch_traces_or_logs(client, data_type, request_id):
     """
-    Tests the 'fetch_traces_or_logs' tool call for traces through the MCP server.
+    Tests the 'fetch_traces_or_logs' tool call for traces and logs through the MCP server.
     """
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": "fetch_traces_or_logs",
-                "arguments": {
-                    "data_type": "traces",
-                    "start_time": "now-1h",
-                    "end_time": "now",
-                    "limit": 5
-                }
-            },
-            "id": "14"
-        }),
-        content_type="application/json"
+    content = _call_tool(
+        client,
+        "fetch_traces_or_logs",
+        {
+            "data_type": data_type,
+            "start_time": "now-1h",
+            "end_time": "now",
+            "limit": 5
+        },
+        request_id=request_id,
     )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "14"
-    assert "result" in response_data
-    content = json.loads(response_data["result"]["content"][0]["text"])
     assert content["status"] in ("success", "error")
     if content["status"] == "success":
         assert "data" in content
         assert "query" in content
-        print(f"Fetched traces: {content['data']}")
+        logger.debug("Fetched %s: %r", data_type, content["data"])
     else:
         assert "message" in content
-        print(f"Error fetching traces: {content['message']}")
+        logger.debug("Error fetching %s: %s", data_type, content["message"])
 
-def test_tool_call_fetch_traces_or_logs_logs(client):
+def test_tool_call_fetch_traces_or_logs_invalid_type(client):
     """
-    Tests the 'fetch_traces_or_logs' tool call for logs through the MCP server.
+    Tests the 'fetch_traces_or_logs' tool call with an invalid data_type.
     """
-    response = client.post(
-        "/mcp",
-        data=json.dumps({
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": "fetch_traces_or_logs",
-                "arguments": {
-                    "data_type": "logs",
-                    "start_time": "now-1h",
-                    "end_time": "now",
-                    "limit": 5
-                }
-            },
-            "id": "15"
-        }),
-        content_type="application/json"
+    content = _call_tool(
+        client,
+        "fetch_traces_or_logs",
+        {
+            "data_type": "invalid_type",
+            "start_time": "now-1h",
+            "end_time": "now",
+            "limit": 5
+        },
+        request_id="16",
     )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "15"
-    assert "result" in response_data
-    content = json.loads(response_data["result"]["content"][0]["text"])
-    assert content["status"] in ("success", "error")
-    if content["status"] == "success":
-        assert "data" in content
-        assert "query" in content
-        print(f"Fetched logs: {content['data']}")
-    else:
-        assert "message" in content
-        print(f"Error fetching logs: {content['message']}")
+    assert content["status"] == "error"
+    assert "Invalid data_type" in content["message"]
+    logger.debug("Correctly handled invalid data_type: %s", content["message"]) 
 
-def test_tool_call_fetch_traces_or_logs_invalid_type(client):
+def test_tool_call_batch(client, dashboards):
     """
-    Tests the 'fetch_traces_or_logs' tool call with an invalid data_type.
+    Tests several independent tool calls sent as one JSON-RPC batch.
+    """
+    assert dashboards
+    dashboard = dashboards[0]
+
+    connection, details, data = _call_tools_batch(
+        client,
+        [
+            ("test_connection", {}, "17"),
+            ("fetch_dashboard_details", {"dashboard_id": dashboard["id"]}, "18"),
+            ("fetch_dashboard_data", {"dashboard_name": dashboard["data"]["title"]}, "19"),
+        ],
+    )
+    assert connection["status"] == "success"
+    assert details["status"] == "success"
+    assert details["data"]["id"] == dashboard["id"]
+    assert data["status"] == "success"
+
+@pytest.mark.parametrize(
+    "name,arguments",
+    [
+        ("fetch_services", {"start_time": None, "duration": "2h"}),
+        ("execute_clickhouse_query", {"query": "SELECT 1 as test_column", "duration": "1h", "step": "60"}),
+        ("fetch_traces_or_logs", {"data_type": "traces", "duration": "1h", "limit": "5"}),
+    ],
+)
+def test_tool_call_accepts_null_and_numeric_string_arguments(client, name, arguments):
+    """
+    Tests that null optional arguments and numbers sent as strings pass argument validation.
+    """
+    content = _call_tool(client, name, arguments, request_id="20")
+    assert content["status"] == "success"
+
+def test_tool_call_converts_numeric_string_arguments(client, monkeypatch):
+    """
+    Tests that numbers sent as strings reach the Signoz query as numbers.
+    """
+    from signoz_mcp_server.mcp_server import PROCESSOR
+
+    payloads = []
+
+    def fake_post_query_range(payload):
+        payloads.append(payload)
+        return {"result": []}
+
+    monkeypatch.setattr(PROCESSOR, "_post_query_range", fake_post_query_range)
+
+    _call_tool(client, "execute_clickhouse_query", {"query": "SELECT 1", "duration": "1h", "step": "120"}, request_id="27")
+    _call_tool(client, "fetch_traces_or_logs", {"data_type": "logs", "duration": "1h", "limit": "7"}, request_id="28")
+
+    assert payloads[0]["step"] == 120
+    assert type(payloads[0]["step"]) is int
+    assert payloads[1]["compositeQuery"]["chQueries"]["A"]["query"].endswith("LIMIT 7")
+
+@pytest.mark.parametrize(
+    "name,arguments,message",
+    [
+        ("fetch_dashboard_details", {"dashboard_id": "abc", "unknown": 1}, "must not contain"),
+        ("fetch_dashboard_details", {"dashboard_id": 5}, "must be string"),
+        ("fetch_dashboard_details", {"dashboard_id": None}, "must contain ['dashboard_id']"),
+        ("execute_clickhouse_query", {"query": "SELECT 1", "step": "abc"}, "step"),
+        ("fetch_traces_or_logs", {"data_type": "logs", "limit": "five"}, "limit"),
+    ],
+)
+def test_tool_call_rejects_invalid_arguments(client, name, arguments, message):
+    """
+    Tests that unknown, mistyped, non-numeric and missing required arguments are rejected as invalid params.
     """
     response = client.post(
         "/mcp",
-        data=json.dumps({
+        data=orjson.dumps({
             "jsonrpc": "2.0",
             "method": "tools/call",
-            "params": {
-                "name": "fetch_traces_or_logs",
-                "arguments": {
-                    "data_type": "invalid_type",
-                    "start_time": "now-1h",
-                    "end_time": "now",
-                    "limit": 5
-                }
-            },
-            "id": "16"
+            "params": {"name": name, "arguments": arguments},
+            "id": "21"
         }),
-        content_type="application/json"
+        content_type="application/json",
     )
-    assert response.status_code == 200
-    response_data = response.get_json()
-    assert response_data["id"] == "16"
-    assert "result" in response_data
-    content = json.loads(response_data["result"]["content"][0]["text"])
-    assert content["status"] == "error"
-    assert "Invalid data_type" in content["message"]
-    print(f"Correctly handled invalid data_type: {content['message']}") 
\ No newline at end of file
+    assert response.status_code == 400
+    response_data = orjson.loads(response.get_data())
+    assert response_data["error"]["code"] == -32602
+    assert message in response_data["error"]["message"]
+
+def test_cache_clear_refetches_dashboards(client, monkeypatch):
+    """
+    Tests that a dashboard listing is served from cache until a '_cache_clear' request, and refetched after it.
+    """
+    from signoz_mcp_server.mcp_server import PROCESSOR
+
+    fetches = []
+    request_dashboards = PROCESSOR._request_dashboards
+
+    def counting_request_dashboards():
+        fetches.append(1)
+        return request_dashboards()
+
+    monkeypatch.setattr(PROCESSOR, "_request_dashboards", counting_request_dashboards)
+
+    def cache_clear():
+        response = client.post(
+            "/mcp",
+            data=orjson.dumps({"jsonrpc": "2.0", "method": "_cache_clear", "id": "22"}),
+            content_type="application/json",
+        )
+        assert response.status_code == 200
+        assert orjson.loads(response.get_data()) == {"jsonrpc": "2.0", "result": {}, "id": "22"}
+
+    cache_clear()
+    _call_tool(client, "fetch_dashboards", {}, request_id="23")
+    _call_tool(client, "fetch_dashboards", {}, request_id="24")
+    assert len(fetches) == 1
+
+    cache_clear()
+    content = _call_tool(client, "fetch_dashboards", {}, request_id="25")
+    assert content["status"] == "success"
+    assert len(fetches) == 2
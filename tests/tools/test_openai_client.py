@@ -1,9 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from tests.clients.openai import OpenAIMCPClient
-from tests.conftest import assert_response_quality
+from tests.conftest import _openai_api_key, assert_response_quality
+
+# Mark all tests in this file as 'integration'; with MCP_CACHE_OPENAI=1 OpenAI replies are replayed from .pytest_cache
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(not _openai_api_key(), reason="OpenAI API key not available"),
+]
 
-# Mark all tests in this file as 'integration'
-pytestmark = pytest.mark.integration
+def paraphrases(queries):
+    """Parametrize values where every query after the first is an alternate wording, only run with --full-paraphrases."""
+    return [queries[0], *(pytest.param(query, marks=pytest.mark.paraphrase) for query in queries[1:])]
 
 # Test data for parameterized testing
 test_models = ["gpt-4.1"]
@@ -22,23 +30,16 @@ dashboard_queries = [
     "Show me the dashboards.",
     "List all dashboards available.",
 ]
-
-@pytest.fixture(scope="module")
-def mcp_client(openai_api_key, client):
-    """Fixture to create an OpenAIMCPClient instance for testing."""
-    if not openai_api_key:
-        pytest.skip("OpenAI API key not available")
-
-    mcp_client_instance = OpenAIMCPClient(
-        test_client=client,
-        openai_api_key=openai_api_key,
-    )
-    yield mcp_client_instance
-    mcp_client_instance.close()
+COMPREHENSIVE_CASES = [
+    ("Test the connection to SigNoz.", ["connection_status"]),
+    ("Fetch all services from SigNoz.", ["services_info"]),
+    ("Fetch all available dashboards from SigNoz.", ["dashboard_info"]),
+    ("Fetch data for the Python Microservices dashboard.", ["dashboard_data:Python Microservices"]),
+    ("Fetch APM metrics for the 'recommendationservice' service.", ["apm_metrics:recommendationservice"]),
+]
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.parametrize("query", service_queries)
-@pytest.mark.flaky(max_runs=3)
+@pytest.mark.parametrize("query", paraphrases(service_queries))
 @pytest.mark.pass_rate(0.8)
 def test_fetch_services_robust(mcp_client, evaluator, model, query):
     """Test fetching services using LLM evaluation."""
@@ -55,8 +56,7 @@ def test_fetch_services_robust(mcp_client, evaluator, model, query):
     )
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.parametrize("query", connection_queries)
-@pytest.mark.flaky(max_runs=3)
+@pytest.mark.parametrize("query", paraphrases(connection_queries))
 @pytest.mark.pass_rate(0.8)
 def test_connection_status_robust(mcp_client, evaluator, model, query):
     """Test connection status using LLM evaluation."""
@@ -73,8 +73,7 @@ def test_connection_status_robust(mcp_client, evaluator, model, query):
     )
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.parametrize("query", dashboard_queries)
-@pytest.mark.flaky(max_runs=3)
+@pytest.mark.parametrize("query", paraphrases(dashboard_queries))
 @pytest.mark.pass_rate(0.8)
 def test_fetch_dashboards_robust(mcp_client, evaluator, model, query):
     """Test fetching dashboards using LLM evaluation."""
@@ -91,7 +90,6 @@ def test_fetch_dashboards_robust(mcp_client, evaluator, model, query):
     )
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.flaky(max_runs=3)
 @pytest.mark.pass_rate(0.8)
 def test_fetch_dashboard_data_python(mcp_client, evaluator, model):
     """Test fetching Python Microservices dashboard data."""
@@ -109,7 +107,6 @@ def test_fetch_dashboard_data_python(mcp_client, evaluator, model):
     )
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.flaky(max_runs=3)
 @pytest.mark.pass_rate(0.8)
 def test_fetch_dashboard_data_go_with_duration(mcp_client, evaluator, model):
     """Test fetching Go Microservices dashboard data with duration."""
@@ -127,7 +124,6 @@ def test_fetch_dashboard_data_go_with_duration(mcp_client, evaluator, model):
     )
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.flaky(max_runs=3)
 @pytest.mark.pass_rate(0.8)
 def test_fetch_apm_metrics_recommendation_service(mcp_client, evaluator, model):
     """Test fetching APM metrics for recommendation service."""
@@ -145,7 +141,6 @@ def test_fetch_apm_metrics_recommendation_service(mcp_client, evaluator, model):
     )
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.flaky(max_runs=3)
 @pytest.mark.pass_rate(0.8)
 def test_fetch_apm_metrics_with_duration(mcp_client, evaluator, model):
     """Test fetching APM metrics with time duration."""
@@ -162,36 +157,44 @@ def test_fetch_apm_metrics_with_duration(mcp_client, evaluator, model):
         required_checks=["is_helpful"]
     )
 
-@pytest.mark.flaky(max_runs=3)
-@pytest.mark.pass_rate(0.7)
-def test_comprehensive_signoz_interaction(mcp_client, evaluator):
-    """Comprehensive test that checks multiple interactions in sequence."""
-    
-    interactions = [
-        ("Test the connection to SigNoz.", ["connection_status"]),
-        ("Fetch all services from SigNoz.", ["services_info"]),
-        ("Fetch all available dashboards from SigNoz.", ["dashboard_info"]),
-        ("Fetch data for the Python Microservices dashboard.", ["dashboard_data:Python Microservices"]),
-        ("Fetch APM metrics for the 'recommendationservice' service.", ["apm_metrics:recommendationservice"]),
+@pytest.fixture(scope="module")
+def comprehensive_responses(request, mcp_client):
+    """
+    Starts the chats of every selected comprehensive case at once from a thread pool; each case waits only on its own reply.
+    Cases left out of the run (-k, --lf, a single node id) are not started.
+    Maps each query to the future of its response, so a failed chat fails only its own case.
+    """
+    selected = [
+        item.callspec.params["query"]
+        for item in request.session.items
+        if getattr(item, "originalname", None) == "test_comprehensive_signoz_interaction" and hasattr(item, "callspec")
     ]
-    
-    for query, checks in interactions:
-        messages = [{"role": "user", "content": query}]
-        response = mcp_client.chat(messages=messages, model="gpt-4o")
-        
-        assert_response_quality(
-            prompt=query,
-            response=response,
-            evaluator=evaluator,
-            min_pass_rate=0.8,
-            specific_checks=checks,
-            required_checks=["is_helpful"]
-        )
+    with ThreadPoolExecutor(max_workers=max(len(selected), 1)) as executor:
+        yield {
+            query: executor.submit(mcp_client.chat, messages=[{"role": "user", "content": query}], model="gpt-4o")
+            for query in dict.fromkeys(selected)
+        }
+
+@pytest.mark.parametrize(
+    "query,checks", COMPREHENSIVE_CASES, ids=[case[0][:30] for case in COMPREHENSIVE_CASES]
+)
+@pytest.mark.pass_rate(0.7)
+def test_comprehensive_signoz_interaction(comprehensive_responses, evaluator, query, checks):
+    """Comprehensive test covering one of several typical interactions per case."""
+    response = comprehensive_responses[query].result()
+
+    assert_response_quality(
+        prompt=query,
+        response=response,
+        evaluator=evaluator,
+        min_pass_rate=0.8,
+        specific_checks=checks,
+        required_checks=["is_helpful"]
+    )
 
 # --- NEW TESTS FOR ADDITIONAL TOOLS ---
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.flaky(max_runs=3)
 @pytest.mark.pass_rate(0.8)
 def test_fetch_dashboard_details_robust(mcp_client, evaluator, model):
     """Test fetching dashboard details for a specific dashboard ID."""
@@ -211,7 +214,6 @@ def test_fetch_dashboard_details_robust(mcp_client, evaluator, model):
     )
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.flaky(max_runs=3)
 @pytest.mark.pass_rate(0.8)
 def test_execute_clickhouse_query_robust(mcp_client, evaluator, model):
     """Test executing a Clickhouse SQL query."""
@@ -229,7 +231,6 @@ def test_execute_clickhouse_query_robust(mcp_client, evaluator, model):
     )
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.flaky(max_runs=3)
 @pytest.mark.pass_rate(0.8)
 def test_execute_builder_query_robust(mcp_client, evaluator, model):
     """Test executing a builder query for request rate grouped by service."""
@@ -247,7 +248,6 @@ def test_execute_builder_query_robust(mcp_client, evaluator, model):
     )
 
 @pytest.mark.parametrize("model", test_models)
-@pytest.mark.flaky(max_runs=3)
 @pytest.mark.pass_rate(0.8)
 def test_fetch_traces_or_logs_robust(mcp_client, evaluator, model):
     """Test fetching traces from SigNoz (logs part skipped due to schema mismatch)."""
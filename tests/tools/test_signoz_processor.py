@@ -1,15 +1,76 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from signoz_mcp_server.processor.signoz_processor import SignozApiProcessor
 
-@pytest.fixture
+logger = logging.getLogger(__name__)
+
+# Simple builder query to test the connection and basic functionality
+BUILDER_QUERIES = {
+    "A": {
+        "queryName": "A",
+        "expression": "A",
+        "dataSource": "metrics",
+        "aggregateOperator": "sum",
+        "aggregateAttribute": {
+            "key": "signoz_calls_total",
+            "dataType": "float64",
+            "isColumn": True,
+            "type": ""
+        },
+        "timeAggregation": "sum",
+        "spaceAggregation": "sum",
+        "functions": [],
+        "filters": {
+            "items": [],
+            "op": "AND"
+        },
+        "disabled": False,
+        "stepInterval": 60,
+        "legend": "Test Query",
+        "groupBy": []
+    }
+}
+
+@pytest.fixture(scope="session")
 def processor(signoz_config):
     """
     Provides a SignozApiProcessor instance configured for live API testing.
     """
-    return SignozApiProcessor(
+    processor = SignozApiProcessor(
         signoz_host=signoz_config["host"],
         signoz_api_key=signoz_config.get("api_key")
     )
+    yield processor
+    processor.close()
+
+@pytest.fixture
+def time_range():
+    """
+    Provides a recent time range (the last hour) as (start, end) epoch seconds.
+    """
+    end_time = datetime.now(timezone.utc)
+    start_time = end_time - timedelta(hours=1)
+    return start_time.timestamp(), end_time.timestamp()
+
+@pytest.fixture(scope="module")
+def dashboards(request, processor, signoz_config):
+    """
+    Fetches the dashboard list once for the tests that need an existing dashboard.
+    With --cache-signoz, the listing saved in .pytest_cache for the same host is reused across runs.
+    """
+    cache = getattr(request.config, "cache", None)
+    if request.config.getoption("--cache-signoz") and cache is not None:
+        cached = cache.get("signoz/dashboards", None)
+        if cached and cached.get("host") == signoz_config["host"]:
+            return cached["dashboards"]
+    dashboards = processor.fetch_dashboards()
+    assert dashboards is not None and dashboards["data"]
+    if cache is not None:
+        cache.set("signoz/dashboards", {"host": signoz_config["host"], "dashboards": dashboards})
+    return dashboards
 
 def test_connection(processor):
     """
@@ -25,24 +86,20 @@ def test_fetch_dashboards(processor):
     assert dashboards is not None
     assert isinstance(dashboards["data"], list)
 
-def test_fetch_dashboard_details(processor):
+def test_fetch_dashboard_details(processor, dashboards):
     """
     Tests fetching dashboard details from the live Signoz API.
     """
-    dashboards = processor.fetch_dashboards()
-    assert dashboards is not None and dashboards["data"]
-    
     dashboard_id = dashboards["data"][0]["id"]
     details = processor.fetch_dashboard_details(dashboard_id)
     
     assert details is not None
     assert details["id"] == dashboard_id
 
-def test_parse_step():
+def test_parse_step(processor):
     """
     Tests the _parse_step utility function with various time formats.
     """
-    processor = SignozApiProcessor(signoz_host="http://localhost:3301")
     assert processor._parse_step("60s") == 60
     assert processor._parse_step("5m") == 300
     assert processor._parse_step("1h") == 3600
@@ -50,35 +107,94 @@ def test_parse_step():
     assert processor._parse_step(120) == 120
     assert processor._parse_step("invalid") == 60  # Default value
 
-def test_fetch_dashboard_data(processor):
+def test_fetch_dashboard_data(processor, dashboards):
     """
     Tests fetching data for a specific dashboard from the live Signoz API.
     """
-    dashboards = processor.fetch_dashboards()
-    assert dashboards is not None and dashboards["data"]
-
     dashboard_title = dashboards["data"][0]["data"]["title"]
     data = processor.fetch_dashboard_data(dashboard_title)
     
     assert data is not None
 
-def test_fetch_apm_metrics(processor):
+def _builder_panel(title, query_count):
+    """A dashboard panel with query_count builder queries."""
+    query_data = [{"dataSource": "metrics", "aggregateOperator": "sum"} for _ in range(query_count)]
+    return {"title": title, "panelTypes": "graph", "query": {"queryType": "builder", "builder": {"queryData": query_data}}}
+
+@pytest.fixture
+def posted_payloads(processor, monkeypatch):
+    """
+    Records the query_range payloads the processor would POST, answering each with an empty result.
+    """
+    payloads = []
+
+    def fake_post_query_range(payload):
+        payloads.append(payload)
+        return {"result": []}
+
+    monkeypatch.setattr(processor, "_post_query_range", fake_post_query_range)
+    return payloads
+
+def test_fetch_dashboard_data_query_letters(processor, posted_payloads, monkeypatch):
+    """
+    Tests that builder query names restart at A in each panel and that a panel over the A-Z limit is reported.
+    """
+    dashboard = {"data": {"widgets": [_builder_panel("First", 2), _builder_panel("Second", 3), _builder_panel("Too many", 27)]}}
+    monkeypatch.setattr(processor, "_fetch_known_dashboard_details", lambda dashboard_name: dashboard)
+
+    data = processor.fetch_dashboard_data("Letters")
+
+    assert data["status"] == "success"
+    assert data["results"]["First"]["status"] == "success"
+    assert data["results"]["Second"]["status"] == "success"
+    assert data["results"]["Too many"]["status"] == "error"
+    assert "27 builder queries" in data["results"]["Too many"]["message"]
+    # Only the panels within the limit are sent, each named from A
+    assert [sorted(p["compositeQuery"]["builderQueries"]) for p in posted_payloads] in (
+        [["A", "B"], ["A", "B", "C"]],
+        [["A", "B", "C"], ["A", "B"]],
+    )
+
+def test_fetch_apm_metrics_too_many_metrics(processor, posted_payloads):
+    """
+    Tests that requesting more metrics than there are query letters returns an error without querying Signoz.
+    """
+    result = processor.fetch_apm_metrics("frontend", metrics=["request_rate"] * 27)
+    assert "Too many metrics" in result["error"]
+    # latency_avg takes two letters, so 25 single-query metrics plus latency_avg are one too many
+    result = processor.fetch_apm_metrics("frontend", metrics=["request_rate"] * 25 + ["latency_avg"])
+    assert "Too many metrics" in result["error"]
+    assert posted_payloads == []
+
+def test_fetch_apm_metrics_latency_query_names(processor, posted_payloads):
+    """
+    Tests that latency queries take the next free letters instead of overwriting earlier metrics' queries.
+    """
+    processor.fetch_apm_metrics("frontend", metrics=["request_rate", "request_rate", "error_rate", "latency_avg"])
+
+    builder_queries = posted_payloads[0]["compositeQuery"]["builderQueries"]
+    assert sorted(builder_queries) == ["A", "B", "C", "D", "D/E", "E"]
+    assert builder_queries["C"]["legend"] == "Error Rate"
+    assert builder_queries["D"]["legend"] == "Latency Sum"
+    assert builder_queries["E"]["legend"] == "Latency Count"
+    assert builder_queries["D/E"]["expression"] == "D/E"
+    assert all(query["expression"] == name for name, query in builder_queries.items())
+
+def test_fetch_apm_metrics(processor, dashboards):
     """
     Tests fetching APM metrics from the live Signoz API.
     """
     # To fetch apm metrics we need a service name, this can be fetched from the dashboard
-    dashboards = processor.fetch_dashboards()
-    assert dashboards is not None and dashboards["data"]
-
-    for dashboard in dashboards["data"]:
-        if "service" in dashboard["data"]["title"].lower():
-            dashboard_details = processor.fetch_dashboard_details(dashboard["id"])
-            if dashboard_details:
-                service_name = dashboard_details.get("data", {}).get("title")
-                if service_name:
-                    apm_metrics = processor.fetch_apm_metrics(service_name)
-                    assert apm_metrics is not None
-                    return
+    candidates = [d for d in dashboards["data"] if "service" in d["data"]["title"].lower()]
+    # Fetch the candidates' details concurrently; the first one in listing order with a title wins
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for dashboard_details in executor.map(lambda d: processor.fetch_dashboard_details(d["id"]), candidates):
+            service_name = (dashboard_details or {}).get("data", {}).get("title")
+            if service_name:
+                executor.shutdown(wait=False, cancel_futures=True)
+                apm_metrics = processor.fetch_apm_metrics(service_name)
+                assert apm_metrics is not None
+                return
 
     pytest.skip("Could not find a service name to test APM metrics") 
 
@@ -87,7 +203,7 @@ def test_fetch_services(processor):
     Tests fetching all instrumented services from the live Signoz API.
     """
     result = processor.fetch_services()
-    print(result)
+    logger.debug("fetch_services result: %r", result)
     if isinstance(result, dict) and result.get("status") == "error":
         pytest.fail(result.get("message", "Failed to fetch services"))
     elif isinstance(result, dict) and "data" in result:
@@ -97,22 +213,18 @@ def test_fetch_services(processor):
     else:
         pytest.fail("Unexpected result format from fetch_services") 
 
-def test_execute_clickhouse_query_tool(processor):
+def test_execute_clickhouse_query_tool(processor, time_range):
     """
     Tests the execute_clickhouse_query_tool method directly on the SignozApiProcessor.
     """
     # Simple Clickhouse query to test the connection and basic functionality
     test_query = "SELECT 1 as test_column"
     
-    # Use a recent time range (last hour)
-    from datetime import datetime, timezone, timedelta
-    end_time = datetime.now(timezone.utc)
-    start_time = end_time - timedelta(hours=1)
-    
+    time_geq, time_lt = time_range
     result = processor.execute_clickhouse_query_tool(
         query=test_query,
-        time_geq=start_time.timestamp(),
-        time_lt=end_time.timestamp(),
+        time_geq=time_geq,
+        time_lt=time_lt,
         panel_type="table",
         fill_gaps=False,
         step=60
@@ -129,48 +241,17 @@ def test_execute_clickhouse_query_tool(processor):
     else:
         # Success case - should have some data structure
         assert result is not None
-        print(f"Successfully executed Clickhouse query: {test_query}")
+        logger.debug("Successfully executed Clickhouse query: %s", test_query)
 
-def test_execute_builder_query_tool(processor):
+def test_execute_builder_query_tool(processor, time_range):
     """
     Tests the execute_builder_query_tool method directly on the SignozApiProcessor.
     """
-    # Simple builder query to test the connection and basic functionality
-    test_builder_queries = {
-        "A": {
-            "queryName": "A",
-            "expression": "A",
-            "dataSource": "metrics",
-            "aggregateOperator": "sum",
-            "aggregateAttribute": {
-                "key": "signoz_calls_total",
-                "dataType": "float64",
-                "isColumn": True,
-                "type": ""
-            },
-            "timeAggregation": "sum",
-            "spaceAggregation": "sum",
-            "functions": [],
-            "filters": {
-                "items": [],
-                "op": "AND"
-            },
-            "disabled": False,
-            "stepInterval": 60,
-            "legend": "Test Query",
-            "groupBy": []
-        }
-    }
-    
-    # Use a recent time range (last hour)
-    from datetime import datetime, timezone, timedelta
-    end_time = datetime.now(timezone.utc)
-    start_time = end_time - timedelta(hours=1)
-    
+    time_geq, time_lt = time_range
     result = processor.execute_builder_query_tool(
-        builder_queries=test_builder_queries,
-        time_geq=start_time.timestamp(),
-        time_lt=end_time.timestamp(),
+        builder_queries=BUILDER_QUERIES,
+        time_geq=time_geq,
+        time_lt=time_lt,
         panel_type="table",
         step=60
     )
@@ -186,4 +267,4 @@ def test_execute_builder_query_tool(processor):
     else:
         # Success case - should have some data structure
         assert result is not None
-        print(f"Successfully executed builder query") 
\ No newline at end of file
+        logger.debug("Successfully executed builder query") 
\ No newline at end of file
@@ -1,205 +1,361 @@
 """
-Utility functions for robust LLM evaluation using langevals.
+Utility functions for robust LLM evaluation using langevals and a batched OpenAI judge.
 """
-from typing import Dict, Any, List, Optional
-import pandas as pd
-from langevals import expect
+import functools
+import hashlib
+import math
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+import orjson
+from openai import OpenAI, OpenAIError
 from langevals_langevals.llm_boolean import (
+    CustomLLMBooleanEntry,
     CustomLLMBooleanEvaluator,
     CustomLLMBooleanSettings,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Yes/no questions the judge model answers about a response; the {placeholders} are filled per check
+HELPFUL_CRITERION = "Is this response helpful and does it appropriately address the user's question about SigNoz monitoring data?"
+STRUCTURED_CRITERION = "Is this response well-structured, clearly formatted, and easy to read for monitoring data?"
+SERVICES_INFO_CRITERION = "Does the response contain specific information about services from SigNoz, including service names like 'Recommendation Service', 'Shipping Service', or 'Email Service'?"
+CONNECTION_STATUS_CRITERION = "Does the response contain connection status information with details like 'success', 'host', and 'SSL verification'?"
+DASHBOARD_INFO_CRITERION = "Does the response contain specific information about dashboards from SigNoz, mentioning dashboard names like 'Python Microservices' or 'Go Microservices'?"
+DASHBOARD_DATA_CRITERION = "Does the response contain specific data for the '{dashboard_name}' dashboard, including metrics like 'Total Calls', 'Latencies', or 'Traces by Service'?"
+APM_METRICS_CRITERION = "Does the response contain APM metrics for the '{service_name}' service, including metrics like 'Latency', 'Error Rate', 'Request Count', or 'Request Rate'?"
+DASHBOARD_DETAILS_CRITERION = "Does the response contain detailed information for the dashboard with ID '{dashboard_id}', such as its name, panels, or description?"
+CLICKHOUSE_QUERY_RESULT_CRITERION = "Does the response contain results from a Clickhouse SQL query, such as a table of data or a count of records?"
+BUILDER_QUERY_RESULT_CRITERION = "Does the response contain results from a SigNoz builder query, such as metrics grouped by service or time?"
+TRACES_INFO_CRITERION = "Does the response contain trace information from SigNoz, such as trace IDs, service names, durations, or timestamps?"
+LOGS_INFO_CRITERION = "Does the response contain log information from SigNoz, such as log messages, timestamps, severity, or service names?"
+
+# A check passes when the judge's P(true) reaches this; plain bools pass as 1.0 and fail as 0.0
+PASS_THRESHOLD = 0.5
+
+BATCH_JUDGE_INSTRUCTIONS = (
+    "You grade an assistant's response to a user's question about SigNoz monitoring data. "
+    "Answer every criterion with true or false. Reply with a JSON object that maps each criterion's key to its boolean."
+)
+
+BOOLEAN_JUDGE_INSTRUCTIONS = (
+    "You grade an assistant's response to a user's question about SigNoz monitoring data. "
+    "Answer the criterion with a single word: true or false."
+)
+
+def _true_probability(top_logprobs) -> Optional[float]:
+    """P(true) among an answer token's true/false alternatives, or None when neither is among them."""
+    probabilities = {}
+    for alternative in top_logprobs:
+        probabilities.setdefault(alternative.token.strip().lower(), math.exp(alternative.logprob))
+    p_true, p_false = probabilities.get("true", 0.0), probabilities.get("false", 0.0)
+    return p_true / (p_true + p_false) if p_true + p_false else None
+
+# Judge requests in flight at once in this process; SIGNOZ_EVAL_CONCURRENCY lowers it to stay under the provider's rate limit
+_JUDGE_SEMAPHORE = threading.BoundedSemaphore(int(os.environ.get("SIGNOZ_EVAL_CONCURRENCY") or 16))
+
+@functools.lru_cache(maxsize=64)
+def _get_bool_evaluator(criterion: str, model: str) -> CustomLLMBooleanEvaluator:
+    """Build the langevals evaluator for a criterion once; it holds only settings, so calls can share it."""
+    return CustomLLMBooleanEvaluator(
+        settings=CustomLLMBooleanSettings(
+            prompt=criterion,
+            model=model,
+        )
+    )
+
+# Verdict scores (P(true), or 1.0/0.0 without logprobs) are cached across runs per (model that produced the score,
+# judge instructions, criterion, prompt, response), so editing the instructions invalidates them; EVAL_CACHE_BUST=1 ignores them
+EVAL_CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache", "evals")
+
+def _verdict_cache_path(model: str, criterion: str, prompt: str, response: str) -> str:
+    # Prompts differing only in case or whitespace share a verdict
+    normalized_prompt = " ".join(prompt.lower().split())
+    key = orjson.dumps([model, BATCH_JUDGE_INSTRUCTIONS, BOOLEAN_JUDGE_INSTRUCTIONS, criterion, normalized_prompt, response])
+    return os.path.join(EVAL_CACHE_DIR, hashlib.sha256(key).hexdigest() + ".json")
+
+def _read_cached_score(path: str) -> Optional[float]:
+    if os.environ.get("EVAL_CACHE_BUST") == "1":
+        return None
+    try:
+        with open(path, "rb") as f:
+            score = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    # Entries written before scores were kept hold a bare bool
+    return float(score) if isinstance(score, (bool, int, float)) else None
+
+def write_file_atomic(path: str, data: bytes) -> None:
+    """Write data to path, creating its directory; written then renamed so concurrent test workers never read a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _write_cached_score(path: str, score: float) -> None:
+    write_file_atomic(path, orjson.dumps(score))
+
 class SignozResponseEvaluator:
     """Evaluator for SigNoz MCP Server responses."""
     
-    def __init__(self, model: str = "gpt-4o"):
+    def __init__(self, model: str = "gpt-4o-mini", escalate_model: Optional[str] = "gpt-4o", escalation_margin: float = 0.2):
+        """
+        model answers every check. A batched verdict whose true/false probabilities differ by less than
+        escalation_margin is asked again of escalate_model; pass escalate_model=None to never escalate.
+        """
         self.model = model
+        self.escalate_model = escalate_model
+        self.escalation_margin = escalation_margin
+        # Created on first batched judge call and reused, so its connection pool stays warm across responses
+        self._openai_client = None
+    
+    def _client(self) -> OpenAI:
+        if self._openai_client is None:
+            self._openai_client = OpenAI()
+        return self._openai_client
+    
+    def _boolean_judge(self, prompt: str, response: str, criterion: str) -> Optional[float]:
+        """
+        Ask the judge model a single criterion with a one-token answer and return P(true) from its logprobs.
+        Returns None when the call fails or the answer token is neither true nor false.
+        """
+        try:
+            with _JUDGE_SEMAPHORE:
+                completion = self._client().chat.completions.create(
+                    model=self.model.removeprefix("openai/"),
+                    messages=[
+                        {"role": "system", "content": BOOLEAN_JUDGE_INSTRUCTIONS},
+                        {"role": "user", "content": f"Question:\n{prompt}\n\nResponse:\n{response}\n\nCriterion:\n{criterion}"},
+                    ],
+                    max_tokens=1,
+                    temperature=0,
+                    logprobs=True,
+                    top_logprobs=5,
+                )
+        except OpenAIError:
+            return None
+        logprobs = completion.choices[0].logprobs
+        if logprobs is None or not logprobs.content:
+            return None
+        return _true_probability(logprobs.content[0].top_logprobs)
+    
+    def _score(self, prompt: str, response: str, criterion: str) -> Optional[float]:
+        """
+        P(true) for one criterion, from the one-token judge or, failing that, 1.0/0.0 from langevals.
+        Returns None when neither produced a verdict.
+        """
+        p_true = self._boolean_judge(prompt, response, criterion)
+        if p_true is None:
+            passed = self._passes(prompt, response, criterion)
+            return None if passed is None else float(passed)
+        return p_true
+    
+    def _passes(self, prompt: str, response: str, criterion: str) -> Optional[bool]:
+        """
+        Ask the judge model a single yes/no criterion about the response through langevals.
+        Returns None when the evaluation was skipped or errored, so a failed call is not mistaken for a "false" verdict.
+        """
+        evaluator = _get_bool_evaluator(criterion, self.model)
+        with _JUDGE_SEMAPHORE:
+            result = evaluator.evaluate(CustomLLMBooleanEntry(input=prompt, output=response))
+        if result.status != "processed":
+            return None
+        return bool(result.passed)
+    
+    def close(self):
+        """Close the judge's OpenAI client and its pooled connections, if one was created."""
+        if self._openai_client is not None:
+            self._openai_client.close()
+            self._openai_client = None
+    
+    def _judge(self, prompt: str, response: str, criterion: str) -> Optional[bool]:
+        """
+        Return the cached verdict for a criterion, asking the judge model only on a miss.
+        Returns None, which is not cached, when the judge produced no verdict.
+        """
+        cache_path = _verdict_cache_path(self.model, criterion, prompt, response)
+        score = _read_cached_score(cache_path)
+        if score is None:
+            score = self._score(prompt, response, criterion)
+            if score is None:
+                return None
+            _write_cached_score(cache_path, score)
+        return score >= PASS_THRESHOLD
+    
+    def _ask_judge(self, model: str, prompt: str, response: str, checks: List[Tuple[str, str]]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Ask model every (result_key, criterion) pair in one call.
+        Returns the parsed answers and, for the boolean ones, P(true) from the answer token's logprobs where available.
+        """
+        criteria = "\n".join(f"- {key}: {criterion}" for key, criterion in checks)
+        try:
+            with _JUDGE_SEMAPHORE:
+                completion = self._client().chat.completions.create(
+                    model=model.removeprefix("openai/"),
+                    messages=[
+                        {"role": "system", "content": BATCH_JUDGE_INSTRUCTIONS},
+                        {"role": "user", "content": f"Question:\n{prompt}\n\nResponse:\n{response}\n\nCriteria:\n{criteria}"},
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0,
+                    logprobs=True,
+                    top_logprobs=2,
+                )
+            choice = completion.choices[0]
+            answers = orjson.loads(choice.message.content or "{}")
+        except (OpenAIError, orjson.JSONDecodeError):
+            return {}, {}
+        if not isinstance(answers, dict):
+            return {}, {}
+        # The reply's true/false tokens appear in the same order as its boolean values
+        true_probabilities = [
+            _true_probability(token.top_logprobs)
+            for token in (choice.logprobs.content if choice.logprobs else None) or ()
+            if token.token.strip() in ("true", "false")
+        ]
+        boolean_keys = [key for key, value in answers.items() if isinstance(value, bool)]
+        if len(true_probabilities) != len(boolean_keys):
+            return answers, {}
+        # A probability that disagrees with the answer it came with is dropped
+        return answers, {
+            key: p_true
+            for key, p_true in zip(boolean_keys, true_probabilities)
+            if p_true is not None and (p_true >= PASS_THRESHOLD) == answers[key]
+        }
+    
+    def evaluate_batch(self, prompt: str, response: str, checks: List[Tuple[str, str]], scores: bool = False) -> Dict[str, Any]:
+        """
+        Judge every (result_key, criterion) pair in one LLM call; criteria with a cached verdict are not asked again.
+        Borderline verdicts are asked again of escalate_model, when set, unless it already has a cached verdict for them.
+        Criteria the reply does not answer with a boolean are judged one at a time, concurrently.
+        Returns a bool per key, or with scores=True the judge's P(true) (1.0/0.0 where no logprobs were available).
+        Keys the judge produced no verdict for map to None and are not cached, so the next run asks again.
+        """
+        cache_paths = {key: _verdict_cache_path(self.model, criterion, prompt, response) for key, criterion in checks}
+        results = {key: _read_cached_score(cache_paths[key]) for key, _ in checks}
+        pending = [(key, criterion) for key, criterion in checks if results[key] is None]
+        if pending:
+            answers, confidences = self._ask_judge(self.model, prompt, response, pending)
+            for key, _ in pending:
+                if isinstance(answers.get(key), bool):
+                    results[key] = confidences.get(key, float(answers[key]))
+            unanswered = [(key, criterion) for key, criterion in pending if results[key] is None]
+            if unanswered:
+                with ThreadPoolExecutor(max_workers=len(unanswered)) as executor:
+                    for (key, _), score in zip(unanswered, executor.map(lambda check: self._score(prompt, response, check[1]), unanswered)):
+                        results[key] = score
+            for key, _ in pending:
+                if results[key] is not None:
+                    _write_cached_score(cache_paths[key], results[key])
+        if self.escalate_model:
+            # self.model's own score stays cached under its key; the escalated score is cached under escalate_model's
+            borderline = [
+                (key, criterion) for key, criterion in checks
+                if results[key] is not None and abs(2 * results[key] - 1) < self.escalation_margin
+            ]
+            escalated_paths = {key: _verdict_cache_path(self.escalate_model, criterion, prompt, response) for key, criterion in borderline}
+            to_escalate = []
+            for key, criterion in borderline:
+                score = _read_cached_score(escalated_paths[key])
+                if score is None:
+                    to_escalate.append((key, criterion))
+                else:
+                    results[key] = score
+            if to_escalate:
+                escalated, escalated_confidences = self._ask_judge(self.escalate_model, prompt, response, to_escalate)
+                for key, _ in to_escalate:
+                    if isinstance(escalated.get(key), bool):
+                        results[key] = escalated_confidences.get(key, float(escalated[key]))
+                        _write_cached_score(escalated_paths[key], results[key])
+        if scores:
+            return results
+        return {key: None if score is None else score >= PASS_THRESHOLD for key, score in results.items()}
     
     def contains_services_info(self, prompt: str, response: str) -> bool:
         """Check if response contains valid service information."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt="Does the response contain specific information about services from SigNoz, including service names like 'Recommendation Service', 'Shipping Service', or 'Email Service'?",
-                model=self.model,
-            )
-        )
-        
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, SERVICES_INFO_CRITERION)
     
     def contains_connection_status(self, prompt: str, response: str) -> bool:
         """Check if response contains connection test information."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt="Does the response contain connection status information with details like 'success', 'host', and 'SSL verification'?",
-                model=self.model,
-            )
-        )
-        
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, CONNECTION_STATUS_CRITERION)
     
     def contains_dashboard_info(self, prompt: str, response: str) -> bool:
         """Check if response contains dashboard information."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt="Does the response contain specific information about dashboards from SigNoz, mentioning dashboard names like 'Python Microservices' or 'Go Microservices'?",
-                model=self.model,
-            )
-        )
-        
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, DASHBOARD_INFO_CRITERION)
     
     def contains_dashboard_data(self, prompt: str, response: str, dashboard_name: str) -> bool:
         """Check if response contains specific dashboard data."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt=f"Does the response contain specific data for the '{dashboard_name}' dashboard, including metrics like 'Total Calls', 'Latencies', or 'Traces by Service'?",
-                model=self.model,
-            )
-        )
-        
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, DASHBOARD_DATA_CRITERION.format(dashboard_name=dashboard_name))
     
     def contains_apm_metrics(self, prompt: str, response: str, service_name: str) -> bool:
         """Check if response contains APM metrics for a specific service."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt=f"Does the response contain APM metrics for the '{service_name}' service, including metrics like 'Latency', 'Error Rate', 'Request Count', or 'Request Rate'?",
-                model=self.model,
-            )
-        )
-        
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, APM_METRICS_CRITERION.format(service_name=service_name))
     
     def is_helpful_response(self, prompt: str, response: str) -> bool:
         """Check if response is helpful and addresses the user's question."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt="Is this response helpful and does it appropriately address the user's question about SigNoz monitoring data?",
-                model=self.model,
-            )
-        )
-        
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, HELPFUL_CRITERION)
     
     def is_structured_response(self, prompt: str, response: str) -> bool:
         """Check if response is well-structured and readable."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt="Is this response well-structured, clearly formatted, and easy to read for monitoring data?",
-                model=self.model,
-            )
-        )
-        
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, STRUCTURED_CRITERION)
 
     def contains_dashboard_details(self, prompt: str, response: str, dashboard_id: str) -> bool:
         """Check if response contains details for a specific dashboard ID."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt=f"Does the response contain detailed information for the dashboard with ID '{dashboard_id}', such as its name, panels, or description?",
-                model=self.model,
-            )
-        )
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, DASHBOARD_DETAILS_CRITERION.format(dashboard_id=dashboard_id))
 
     def contains_clickhouse_query_result(self, prompt: str, response: str) -> bool:
         """Check if response contains results from a Clickhouse SQL query."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt="Does the response contain results from a Clickhouse SQL query, such as a table of data or a count of records?",
-                model=self.model,
-            )
-        )
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, CLICKHOUSE_QUERY_RESULT_CRITERION)
 
     def contains_builder_query_result(self, prompt: str, response: str) -> bool:
         """Check if response contains results from a builder query."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt="Does the response contain results from a SigNoz builder query, such as metrics grouped by service or time?",
-                model=self.model,
-            )
-        )
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, BUILDER_QUERY_RESULT_CRITERION)
 
     def contains_traces_info(self, prompt: str, response: str) -> bool:
         """Check if response contains trace information from SigNoz."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt="Does the response contain trace information from SigNoz, such as trace IDs, service names, durations, or timestamps?",
-                model=self.model,
-            )
-        )
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, TRACES_INFO_CRITERION)
 
     def contains_logs_info(self, prompt: str, response: str) -> bool:
         """Check if response contains log information from SigNoz."""
-        evaluator = CustomLLMBooleanEvaluator(
-            settings=CustomLLMBooleanSettings(
-                prompt="Does the response contain log information from SigNoz, such as log messages, timestamps, severity, or service names?",
-                model=self.model,
-            )
-        )
-        try:
-            expect(input=prompt, output=response).to_pass(evaluator)
-            return True
-        except AssertionError:
-            return False
+        return self._judge(prompt, response, LOGS_INFO_CRITERION)
 
-def create_test_dataset(test_cases: List[Dict[str, Any]]) -> pd.DataFrame:
+def create_test_dataset(test_cases: List[Dict[str, Any]]) -> "pd.DataFrame":
     """Create a pandas DataFrame from test cases for evaluation."""
+    # Imported here so collecting the suite does not pay for pandas; nothing else in the tests needs it
+    import pandas as pd
+
     return pd.DataFrame(test_cases)
 
+# specific_checks names mapped to their result key and criterion
+_CHECKS = {
+    "services_info": ("contains_services", SERVICES_INFO_CRITERION),
+    "connection_status": ("contains_connection", CONNECTION_STATUS_CRITERION),
+    "dashboard_info": ("contains_dashboards", DASHBOARD_INFO_CRITERION),
+    "clickhouse_query_result": ("contains_clickhouse_query_result", CLICKHOUSE_QUERY_RESULT_CRITERION),
+    "builder_query_result": ("contains_builder_query_result", BUILDER_QUERY_RESULT_CRITERION),
+    "traces_info": ("contains_traces_info", TRACES_INFO_CRITERION),
+    "logs_info": ("contains_logs_info", LOGS_INFO_CRITERION),
+}
+# "name:argument" checks: result key template, criterion template, and the criterion placeholder the argument fills
+_PARAMETERIZED_CHECKS = {
+    "dashboard_data": ("contains_data_{}", DASHBOARD_DATA_CRITERION, "dashboard_name"),
+    "apm_metrics": ("contains_apm_{}", APM_METRICS_CRITERION, "service_name"),
+    "dashboard_details": ("contains_dashboard_details_{}", DASHBOARD_DETAILS_CRITERION, "dashboard_id"),
+}
+
 def evaluate_response_quality(
     prompt: str, 
     response: str, 
     evaluator: SignozResponseEvaluator,
-    specific_checks: Optional[List[str]] = None
-) -> Dict[str, bool]:
+    specific_checks: Optional[List[str]] = None,
+    scores: bool = False,
+) -> Dict[str, Any]:
     """
     Evaluate response quality using multiple criteria.
     
@@ -208,83 +364,66 @@ def evaluate_response_quality(
         response: The generated response
         evaluator: SignozResponseEvaluator instance
         specific_checks: List of specific checks to run
+        scores: Return the judge's P(true) per check instead of a bool
     
     Returns:
         Dictionary with evaluation results
     """
-    results = {}
-    
     # Always check these basic qualities
-    results["is_helpful"] = evaluator.is_helpful_response(prompt, response)
-    results["is_structured"] = evaluator.is_structured_response(prompt, response)
+    checks = [
+        ("is_helpful", HELPFUL_CRITERION),
+        ("is_structured", STRUCTURED_CRITERION),
+    ]
     
     # Run specific checks if provided
-    if specific_checks:
-        for check in specific_checks:
-            if check == "services_info":
-                results["contains_services"] = evaluator.contains_services_info(prompt, response)
-            elif check == "connection_status":
-                results["contains_connection"] = evaluator.contains_connection_status(prompt, response)
-            elif check == "dashboard_info":
-                results["contains_dashboards"] = evaluator.contains_dashboard_info(prompt, response)
-            elif check.startswith("dashboard_data:"):
-                dashboard_name = check.split(":", 1)[1]
-                results[f"contains_data_{dashboard_name}"] = evaluator.contains_dashboard_data(
-                    prompt, response, dashboard_name
-                )
-            elif check.startswith("apm_metrics:"):
-                service_name = check.split(":", 1)[1]
-                results[f"contains_apm_{service_name}"] = evaluator.contains_apm_metrics(
-                    prompt, response, service_name
-                )
-            elif check.startswith("dashboard_details:"):
-                dashboard_id = check.split(":", 1)[1]
-                results[f"contains_dashboard_details_{dashboard_id}"] = evaluator.contains_dashboard_details(
-                    prompt, response, dashboard_id
-                )
-            elif check == "clickhouse_query_result":
-                results["contains_clickhouse_query_result"] = evaluator.contains_clickhouse_query_result(prompt, response)
-            elif check == "builder_query_result":
-                results["contains_builder_query_result"] = evaluator.contains_builder_query_result(prompt, response)
-            elif check == "traces_info":
-                results["contains_traces_info"] = evaluator.contains_traces_info(prompt, response)
-            elif check == "logs_info":
-                results["contains_logs_info"] = evaluator.contains_logs_info(prompt, response)
+    for check in specific_checks or ():
+        name, separator, argument = check.partition(":")
+        if separator:
+            if name in _PARAMETERIZED_CHECKS:
+                key, criterion, parameter = _PARAMETERIZED_CHECKS[name]
+                checks.append((key.format(argument), criterion.format(**{parameter: argument})))
+        elif name in _CHECKS:
+            checks.append(_CHECKS[name])
     
-    return results
+    # One judge call answers every criterion for this response that has no cached verdict
+    return evaluator.evaluate_batch(prompt, response, checks, scores=scores)
 
 def assert_evaluation_passes(
-    evaluation_results: Dict[str, bool], 
+    evaluation_results: Dict[str, Any], 
     min_pass_rate: float = 0.8,
-    required_checks: Optional[List[str]] = None
+    required_checks: Optional[List[str]] = None,
+    threshold: float = PASS_THRESHOLD,
 ) -> None:
     """
     Assert that evaluation results meet quality standards.
     
     Args:
-        evaluation_results: Results from evaluate_response_quality
-        min_pass_rate: Minimum percentage of checks that must pass
+        evaluation_results: Results from evaluate_response_quality, as bools or scores
+        min_pass_rate: Minimum mean score (for bools, the fraction of checks that passed)
         required_checks: Specific checks that must pass (100% requirement)
+        threshold: Score at or above which a check counts as passed
+    
+    A check the judge produced no verdict for (None) counts as failed and is listed separately.
     """
+    no_verdict = [k for k, v in evaluation_results.items() if v is None]
+    failed_details = [k for k, v in evaluation_results.items() if v is not None and v < threshold]
     total_checks = len(evaluation_results)
-    passed_checks = sum(evaluation_results.values())
-    pass_rate = passed_checks / total_checks if total_checks > 0 else 0.0
+    pass_rate = sum(v for v in evaluation_results.values() if v is not None) / total_checks if total_checks > 0 else 0.0
     
     # Check required checks first (must be 100%)
-    if required_checks:
-        for check in required_checks:
-            if check in evaluation_results and not evaluation_results[check]:
-                failed_details = [k for k, v in evaluation_results.items() if not v]
-                raise AssertionError(
-                    f"Required check '{check}' failed. "
-                    f"Failed checks: {failed_details}. "
-                    f"Overall pass rate: {pass_rate:.2%}"
-                )
+    for check in required_checks or ():
+        if check in evaluation_results and (evaluation_results[check] is None or evaluation_results[check] < threshold):
+            raise AssertionError(
+                f"Required check '{check}' failed. "
+                f"Failed checks: {failed_details}. "
+                f"No verdict: {no_verdict}. "
+                f"Overall pass rate: {pass_rate:.2%}"
+            )
     
     # Check overall pass rate
     if pass_rate < min_pass_rate:
-        failed_details = [k for k, v in evaluation_results.items() if not v]
         raise AssertionError(
             f"Evaluation pass rate {pass_rate:.2%} below minimum {min_pass_rate:.2%}. "
-            f"Failed checks: {failed_details}"
+            f"Failed checks: {failed_details}. "
+            f"No verdict: {no_verdict}"
         ) 
\ No newline at end of file